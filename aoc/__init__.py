@@ -0,0 +1,3 @@
+# shared tooling for running the day solutions without piping each one through its own interpreter
+# the days themselves live in dayN/dayN.py and are imported from here as (namespace) packages
+# since the days import from aoc too, run them from the repo root, e.g. python -m aoc run 5 -i input.txt or python -m day5.day5 < input.txt
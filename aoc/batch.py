@@ -0,0 +1,58 @@
+# solves one day against a whole directory of inputs (e.g. one per user), fanned out over a process pool
+# each worker imports the day's module once and then keeps solving inputs with it, rather than paying for a fresh
+# interpreter (and a fresh import) per input
+#
+# inputs are handed to the workers in chunks of chunksize paths, so with lots of small inputs the per-task overhead
+# of pickling and queueing gets shared out, and results are yielded as each chunk finishes rather than in input order
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+
+from aoc.cache import ResultCache
+from aoc.runner import solve_day
+
+# each worker process opens its own connection to the cache (sqlite connections can't be shared across processes)
+worker_cache = None
+
+def open_worker_cache(cache):
+    global worker_cache
+    if cache is not None and worker_cache is None:
+        (path, max_bytes) = cache
+        worker_cache = ResultCache(path, max_bytes)
+    return worker_cache
+
+def list_inputs(directory):
+    # skip anything hidden (e.g. editor swap files) and any subdirectories
+    names = sorted(name for name in os.listdir(directory) if not name.startswith('.'))
+    return [path for path in (os.path.join(directory, name) for name in names) if os.path.isfile(path)]
+
+def solve_input(day, path, cache=None):
+    record = {'day': day, 'input': path}
+    try:
+        result = solve_day(day, path, cache=cache)
+        record['part1'], record['part2'] = result['part1'], result['part2']
+        record['timings'] = result['timings']
+        if 'cached' in result:
+            record['cached'] = result['cached']
+    except Exception as err:
+        # one bad input shouldn't take the rest of the batch down with it
+        record['error'] = f"{type(err).__name__}: {err}"
+    return record
+
+def solve_chunk(day, paths, cache=None):
+    cache = open_worker_cache(cache)
+    return [solve_input(day, path, cache) for path in paths]
+
+def chunked(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+# cache is an optional (path, max_bytes) pair for a ResultCache that every worker shares
+def batch(day, directory, workers=None, chunksize=1, cache=None):
+    paths = list_inputs(directory)
+    if len(paths) == 0:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solve_chunk, day, chunk, cache) for chunk in chunked(paths, max(1, chunksize))]
+        for future in as_completed(futures):
+            yield from future.result()
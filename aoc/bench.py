@@ -0,0 +1,70 @@
+# runs each day's part1/part2 over generated inputs of increasing size, recording time and peak memory per phase
+# the results come out as JSON so runs can be diffed against each other to catch regressions
+
+import os
+import tempfile
+import time
+
+from aoc.generators import SCALE_UNITS, generate
+from aoc.runner import solve_day
+
+# small enough that a full run of every day finishes in a few minutes with the current solvers
+# pass --scales to go bigger, e.g. --days 1 --scales 1000000 or --days 4 6 12 20 --scales 10000
+DEFAULT_SCALES = {
+    1: [1000, 10000, 100000],
+    2: [1000, 10000, 100000],
+    3: [10000, 100000, 1000000],
+    4: [50, 100, 200],
+    5: [100, 1000, 10000],
+    6: [20, 40, 80],
+    7: [100, 1000, 5000],
+    8: [25, 50, 100],
+    9: [1001, 5001, 10001],
+    10: [50, 100, 200],
+    11: [10, 100, 1000],
+    12: [25, 50, 100],
+    13: [1000, 10000, 100000],
+    14: [100, 500, 1000],
+    15: [20, 35, 50],
+    16: [21, 51, 101],
+    17: [8, 16, 32],
+    18: [1100, 2500, 5000],
+    19: [50, 200, 400],
+    20: [21, 51, 101],
+}
+
+def bench_one(day, scale, seed=0, memory=True, mode=None):
+    record = {'day': day, 'scale': scale, 'unit': SCALE_UNITS[day], 'seed': seed}
+    if mode is not None:
+        record['mode'] = mode
+
+    start = time.perf_counter()
+    data = generate(day, scale, seed)
+    record['generate_seconds'] = time.perf_counter() - start
+    record['input_bytes'] = len(data)
+
+    with tempfile.NamedTemporaryFile(prefix=f"aoc-day{day}-", suffix=".txt", delete=False) as f:
+        f.write(data)
+        path = f.name
+    del data
+
+    # time and memory come from separate runs, since tracing allocations skews the timings
+    try:
+        result = solve_day(day, path, mode=mode)
+        record['timings'] = result['timings']
+        record['part1'], record['part2'] = result['part1'], result['part2']
+
+        if memory:
+            record['peak_memory'] = solve_day(day, path, track_memory=True, mode=mode)['peak_memory']
+    except Exception as err:
+        # keep going - one day falling over at a big scale is a result worth recording, not a reason to lose the rest
+        record['error'] = f"{type(err).__name__}: {err}"
+    finally:
+        os.remove(path)
+
+    return record
+
+def bench(days, scales=None, seed=0, memory=True, mode=None):
+    for day in days:
+        for scale in (scales or DEFAULT_SCALES[day]):
+            yield bench_one(day, scale, seed, memory, mode)
@@ -0,0 +1,132 @@
+# an on-disk cache of answers we've already worked out, so asking again for the same day/part/input is just a lookup
+# entries are keyed by day, part, a hash of the input bytes, and a version tag for the code that produced them
+# the version tag is a hash of the day's source along with every aoc module it pulls in, so editing a solver
+# (or the grid/search code under it) quietly stops its old answers from being served, rather than needing a manual clear.
+# a run with --mode adds the mode to the tag too, since that picks different functions out of the same source
+#
+# it's a single sqlite file, so several batch workers can share it, and it's kept under max_bytes by throwing away
+# whichever entries were used least recently once it grows past that
+
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import sys
+import time
+
+from aoc.inputs import iter_chunks
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'aoc', 'results.sqlite3')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def input_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+# the same hash for an input file, read a chunk at a time rather than all at once
+def file_hash(path):
+    digest = hashlib.sha256()
+    for chunk in iter_chunks(path):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+# the aoc modules a module depends on, found by following whatever aoc modules/functions/classes it has in its globals
+def aoc_dependencies(module, seen=None):
+    seen = seen if seen is not None else {}
+    seen[module.__name__] = module
+    for value in vars(module).values():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+        if isinstance(name, str) and (name == 'aoc' or name.startswith('aoc.')) and name not in seen and name in sys.modules:
+            aoc_dependencies(sys.modules[name], seen)
+    return seen
+
+# worked out once per module per process - the source isn't expected to change under a running solver
+versions = {}
+
+def code_version(module):
+    if module.__name__ in versions:
+        return versions[module.__name__]
+
+    digest = hashlib.sha256()
+    for (name, dependency) in sorted(aoc_dependencies(module).items()):
+        path = getattr(dependency, '__file__', None)
+        if path is None:
+            continue
+        digest.update(name.encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    versions[module.__name__] = digest.hexdigest()[:16]
+    return versions[module.__name__]
+
+class ResultCache:
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or DEFAULT_PATH
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # batch workers each open their own connection to the same file, so wait on each other's writes rather than failing
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS results (
+            day INTEGER NOT NULL,
+            part TEXT NOT NULL,
+            input_hash TEXT NOT NULL,
+            version TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (day, part, input_hash, version))""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.db.commit()
+
+    # answers come back as (True, answer) or (False, None), since None could be an answer in its own right
+    def get(self, day, part, input_hash, version):
+        key = (day, part, input_hash, version)
+        row = self.db.execute("SELECT value FROM results WHERE day = ? AND part = ? AND input_hash = ? AND version = ?", key).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        self.db.execute("UPDATE results SET last_used = ? WHERE day = ? AND part = ? AND input_hash = ? AND version = ?", (time.time(),) + key)
+        self.db.commit()
+        # pickled rather than JSON so answers come back as the same types they went in as (e.g. day 18's coordinate tuple)
+        return True, pickle.loads(row[0])
+
+    def put(self, day, part, input_hash, version, value):
+        blob = pickle.dumps(value)
+        # roughly what the row costs to keep: the answer plus its key
+        size = len(blob) + len(part) + len(input_hash) + len(version) + 8
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", (day, part, input_hash, version, blob, size, time.time()))
+        self.evict()
+        self.db.commit()
+
+    def size(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def evict(self):
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+
+        # oldest first, until we're back under the limit
+        freed = 0
+        doomed = []
+        for (rowid, size) in self.db.execute("SELECT rowid, size FROM results ORDER BY last_used"):
+            doomed.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        self.db.executemany("DELETE FROM results WHERE rowid = ?", doomed)
+
+    def clear(self):
+        self.db.execute("DELETE FROM results")
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,150 @@
+# command line entry point, e.g. python -m aoc run 6 --input day6/input.txt or python -m aoc batch 6 inputs/ --workers 8
+
+import argparse
+import json
+import sys
+import time
+
+from aoc import daemon, memo, trace
+from aoc.batch import batch
+from aoc.bench import bench
+from aoc.cache import DEFAULT_MAX_BYTES, DEFAULT_PATH, ResultCache
+from aoc.generators import SCALE_UNITS
+from aoc.profiling import PhaseProfiler
+from aoc.runner import PHASES, solve_day
+
+def format_seconds(seconds):
+    if seconds < 1:
+        return f"{seconds * 1000:.3f} ms"
+    return f"{seconds:.3f} s"
+
+def print_result(result):
+    cached = result.get('cached', [])
+    print(f"Day {result['day']}" + (f" ({result['mode']})" if 'mode' in result else ""))
+    print(f"Part 1: {result['part1']}" + (" (cached)" if 'part1' in cached else ""))
+    print(f"Part 2: {result['part2']}" + (" (cached)" if 'part2' in cached else ""))
+    for phase in ('cache',) + PHASES:
+        if phase in result['timings']:
+            print(f"  {phase:<6} {format_seconds(result['timings'][phase])}")
+    print(f"  {'total':<6} {format_seconds(sum(result['timings'].values()))}")
+
+def open_cache(args):
+    if args.cache is None:
+        return None
+    return ResultCache(args.cache, max_bytes=args.cache_size * 1024 * 1024)
+
+def add_cache_arguments(parser):
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_PATH, metavar='PATH', help=f"reuse answers already worked out for the same input and code (defaults to {DEFAULT_PATH})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar='MB', help="evict least recently used answers past this size")
+
+def run(args):
+    if args.trace:
+        trace.enable(*args.trace)
+
+    cache = open_cache(args)
+    profiler = PhaseProfiler(args.profile, args.day, top=args.profile_top) if args.profile else None
+    result = solve_day(args.day, args.input, cache=cache, profiler=profiler, mode=args.mode)
+    if args.json:
+        print(json.dumps(result, default=str))
+    else:
+        print_result(result)
+
+    trace.report()
+    if profiler is not None:
+        for path in profiler.written:
+            print(f"wrote {path}", file=sys.stderr)
+
+def run_bench(args):
+    days = args.days or sorted(SCALE_UNITS)
+    records = []
+    for record in bench(days, args.scales, args.seed, memory=not args.no_memory, mode=args.mode):
+        records.append(record)
+        # progress goes to stderr so the JSON on stdout stays clean
+        summary = record.get('error') or ", ".join(f"{phase} {format_seconds(record['timings'][phase])}" for phase in PHASES)
+        print(f"day {record['day']} @ {record['scale']} {record['unit']}: {summary}", file=sys.stderr)
+
+    output = json.dumps(records, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+def run_batch(args):
+    start = time.perf_counter()
+    solved = failed = 0
+    # one JSON object per line, flushed as each input finishes, so the output can be consumed while the batch is running
+    cache = (args.cache, args.cache_size * 1024 * 1024) if args.cache is not None else None
+    for record in batch(args.day, args.directory, workers=args.workers, chunksize=args.chunksize, cache=cache):
+        print(json.dumps(record, default=str), flush=True)
+        if 'error' in record:
+            failed += 1
+        else:
+            solved += 1
+
+    elapsed = time.perf_counter() - start
+    rate = (solved + failed) / elapsed if elapsed > 0 else 0
+    print(f"day {args.day}: {solved} solved, {failed} failed in {format_seconds(elapsed)} ({rate:.1f} inputs/s)", file=sys.stderr)
+
+def run_daemon(args):
+    # before any day is imported, since memos are created (counting or not) when their day is
+    memo.count_hits()
+    if args.memo_size is not None:
+        memo.resize_all(args.memo_size)
+    daemon.preload(args.preload or [])
+
+    server = daemon.make_server(daemon.SolverState(open_cache(args)), port=args.port, socket_path=args.socket)
+    where = args.socket or f"http://127.0.0.1:{args.port}"
+    print(f"solving on {where} (POST /solve/DAY, GET /stats)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='aoc')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="solve one day, timing parse/part1/part2 separately")
+    run_parser.add_argument('day', type=int)
+    run_parser.add_argument('--input', '-i', help="puzzle input file (defaults to stdin)")
+    run_parser.add_argument('--mode', '-m', help="solve with one of the day's alternative solvers, e.g. numpy")
+    run_parser.add_argument('--json', action='store_true', help="print the result as a single JSON object")
+    run_parser.add_argument('--trace', nargs='+', metavar='CHANNEL', help="enable trace channels, e.g. day5 or day7.could_be_true")
+    run_parser.add_argument('--profile', metavar='DIR', help="profile each phase with cProfile and tracemalloc, writing .pstats and allocation reports here")
+    run_parser.add_argument('--profile-top', type=int, default=10, metavar='N', help="allocation sites to list per phase")
+    add_cache_arguments(run_parser)
+    run_parser.set_defaults(handler=run)
+
+    bench_parser = subparsers.add_parser('bench', help="time each day over generated inputs of increasing size")
+    bench_parser.add_argument('--days', type=int, nargs='+', help="days to run (defaults to all of them)")
+    bench_parser.add_argument('--scales', type=int, nargs='+', help="scales to generate, overriding each day's defaults")
+    bench_parser.add_argument('--seed', type=int, default=0)
+    bench_parser.add_argument('--mode', '-m', help="bench one of the days' alternative solvers, e.g. numpy")
+    bench_parser.add_argument('--no-memory', action='store_true', help="skip the (slow) tracemalloc pass")
+    bench_parser.add_argument('--output', '-o', help="write the JSON results here rather than stdout")
+    bench_parser.set_defaults(handler=run_bench)
+
+    batch_parser = subparsers.add_parser('batch', help="solve one day for every input in a directory, over a process pool")
+    batch_parser.add_argument('day', type=int)
+    batch_parser.add_argument('directory', help="directory of puzzle inputs, one per file")
+    batch_parser.add_argument('--workers', '-w', type=int, help="worker processes (defaults to the number of CPUs)")
+    batch_parser.add_argument('--chunksize', '-c', type=int, default=1, help="inputs handed to a worker at a time")
+    add_cache_arguments(batch_parser)
+    batch_parser.set_defaults(handler=run_batch)
+
+    daemon_parser = subparsers.add_parser('daemon', help="keep solving inputs sent over HTTP, with the day modules and their memos kept warm")
+    daemon_parser.add_argument('--port', '-p', type=int, default=8024, help="localhost port to listen on")
+    daemon_parser.add_argument('--socket', '-s', metavar='PATH', help="listen on a unix socket here instead of a port")
+    daemon_parser.add_argument('--memo-size', type=int, metavar='ENTRIES', help="cap every memo table at this many entries")
+    daemon_parser.add_argument('--preload', type=int, nargs='+', metavar='DAY', help="days to import before taking requests")
+    add_cache_arguments(daemon_parser)
+    daemon_parser.set_defaults(handler=run_daemon)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
@@ -0,0 +1,111 @@
+# a long-running solver that keeps the day modules imported and their memos warm between inputs
+# so asking for answers doesn't pay for interpreter startup, imports, or rebuilding memo tables every time
+#
+#     python -m aoc daemon --port 8024               (or --socket /tmp/aoc.sock)
+#     curl --data-binary @day11/input.txt localhost:8024/solve/11
+#     curl localhost:8024/stats
+#
+# POST /solve/N takes the raw puzzle input as the body and answers with the same JSON object as `run --json`
+# GET /stats reports uptime, how many inputs each day has solved, and the hit rates of every memo (and the result cache, if any)
+#
+# requests are handled one at a time - the memos are plain module-level tables, so two solves at once would trip over each other
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import io
+import json
+import os
+import socketserver
+import time
+
+from aoc import memo
+from aoc.runner import load_day, solve_day
+
+class SolverState:
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.started = time.time()
+        self.solved = {}
+        self.errors = 0
+
+    def solve(self, day, data):
+        try:
+            result = solve_day(day, io.BytesIO(data), cache=self.cache)
+        except Exception:
+            self.errors += 1
+            raise
+        self.solved[day] = self.solved.get(day, 0) + 1
+        return result
+
+    def stats(self):
+        stats = {
+            'uptime': time.time() - self.started,
+            'solved': {str(day): count for (day, count) in sorted(self.solved.items())},
+            'errors': self.errors,
+            'memos': memo.stats(),
+        }
+        if self.cache is not None:
+            lookups = self.cache.hits + self.cache.misses
+            stats['cache'] = {
+                'hits': self.cache.hits,
+                'misses': self.cache.misses,
+                'hit_rate': self.cache.hits / lookups if lookups > 0 else None,
+                'bytes': self.cache.size(),
+            }
+        return stats
+
+class SolverHandler(BaseHTTPRequestHandler):
+    def send_json(self, status, body):
+        payload = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self.send_json(200, self.server.state.stats())
+        else:
+            self.send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] != 'solve' or not parts[1].isdigit():
+            self.send_json(404, {'error': f"Unknown path {self.path}, expected /solve/DAY"})
+            return
+
+        day = int(parts[1])
+        try:
+            load_day(day)
+        except ImportError:
+            self.send_json(404, {'error': f"No solver for day {day}"})
+            return
+
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        try:
+            self.send_json(200, self.server.state.solve(day, data))
+        except Exception as err:
+            self.send_json(400, {'day': day, 'error': f"{type(err).__name__}: {err}"})
+
+    # unix socket clients don't have an address, which the default logging expects
+    def address_string(self):
+        return self.client_address[0] if self.client_address else 'local'
+
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    pass
+
+def make_server(state, port=None, socket_path=None, host='127.0.0.1'):
+    if socket_path is not None:
+        # a stale socket left behind by a previous daemon would stop us binding
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, SolverHandler)
+    else:
+        server = HTTPServer((host, port), SolverHandler)
+    server.state = state
+    return server
+
+# days to import up front, so even the first request for them doesn't pay for the import
+def preload(days):
+    for day in days:
+        load_day(day)
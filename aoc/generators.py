@@ -0,0 +1,383 @@
+# synthetic puzzle inputs for every day, so we can see how the solvers scale past the size of the real inputs
+# each generator takes a scale (what it means depends on the day, see SCALE_UNITS) and a seeded Random, and returns the input as bytes
+# the inputs only need to be valid for the solvers - they're not trying to reproduce the exact statistics of the real ones
+
+import random
+
+SCALE_UNITS = {
+    1: "location pairs",
+    2: "reports",
+    3: "characters of memory",
+    4: "grid side",
+    5: "updates",
+    6: "grid side",
+    7: "equations",
+    8: "grid side",
+    9: "disk map digits",
+    10: "grid side",
+    11: "stones",
+    12: "grid side",
+    13: "machines",
+    14: "robots",
+    15: "grid side",
+    16: "maze side",
+    17: "octal digits of register A",
+    18: "falling bytes",
+    19: "towel patterns",
+    20: "maze side",
+}
+
+# builds a translation table so that random bytes map onto the given characters in (roughly) the given proportions
+# this lets us make 10^4 x 10^4 grids with randbytes + translate rather than a Python call per cell
+def weighted_table(weights):
+    table = bytearray()
+    total = sum(weights.values())
+    for (c, weight) in weights.items():
+        table += c.encode() * round(256 * weight / total)
+    # rounding might leave us a few entries off, so pad (or trim) with the first character
+    table = (table + list(weights)[0].encode() * 256)[:256]
+    return bytes(table)
+
+def random_rows(rng, width, height, weights):
+    table = weighted_table(weights)
+    return [bytearray(rng.randbytes(width).translate(table)) for _ in range(height)]
+
+def join_rows(rows):
+    return b"\n".join(bytes(row) for row in rows) + b"\n"
+
+def day1(scale, rng):
+    lines = []
+    for _ in range(scale):
+        left = rng.randrange(10000, 100000)
+        # share values between the lists some of the time, otherwise the similarity score is almost always 0
+        right = left if rng.random() < 0.3 else rng.randrange(10000, 100000)
+        lines.append(f"{left}   {right}")
+    rng.shuffle(lines)
+    return ("\n".join(lines) + "\n").encode()
+
+def day2(scale, rng):
+    lines = []
+    for _ in range(scale):
+        direction = rng.choice((-1, 1))
+        report = [rng.randrange(20, 80)]
+        for _ in range(rng.randrange(4, 8)):
+            report.append(report[-1] + direction * rng.randrange(1, 4))
+
+        # break around half of them, some of which the problem dampener will be able to fix
+        if rng.random() < 0.5:
+            report[rng.randrange(len(report))] = rng.randrange(1, 100)
+        lines.append(" ".join(str(v) for v in report))
+    return ("\n".join(lines) + "\n").encode()
+
+def day3(scale, rng):
+    junk = "!@#$%^&*()[]{}<>?,. '+-_=/:;~whatfromselectwhyhow"
+    pieces = []
+    length = 0
+    while length < scale:
+        roll = rng.random()
+        if roll < 0.3:
+            piece = f"mul({rng.randrange(1, 1000)},{rng.randrange(1, 1000)})"
+        elif roll < 0.4:
+            # almost-instructions that the regexes must not pick up
+            piece = rng.choice(("mul(4*", "mul[3,7]", "mul ( 2 , 4 )", "mul(1234,5)", "mul(6,9!", "?(12,34)"))
+        elif roll < 0.45:
+            piece = rng.choice(("do()", "don't()"))
+        else:
+            piece = "".join(rng.choice(junk) for _ in range(rng.randrange(1, 12)))
+        pieces.append(piece)
+        length += len(piece)
+
+        # the real dumps are split over a handful of long lines
+        if rng.random() < 0.001:
+            pieces.append("\n")
+    return ("".join(pieces) + "\n").encode()
+
+def day4(scale, rng):
+    return join_rows(random_rows(rng, scale, scale, {'X': 1, 'M': 1, 'A': 1, 'S': 1}))
+
+def day5(scale, rng):
+    # every pair of pages gets a rule from one consistent ordering, which is what makes every update sortable
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{pages[i]}|{pages[j]}" for i in range(len(pages)) for j in range(i + 1, len(pages))]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(scale):
+        update = sorted(rng.sample(range(len(pages)), rng.randrange(2, 12) * 2 + 1))
+        update = [pages[i] for i in update]
+        if rng.random() < 0.5:
+            rng.shuffle(update)
+        updates.append(",".join(str(p) for p in update))
+
+    return ("\n".join(rules) + "\n\n" + "\n".join(updates) + "\n").encode()
+
+# walks the guard in a (y, x) grid of rows, returning False if it ends up in a loop
+def guard_escapes(rows, position):
+    height, width = len(rows), len(rows[0])
+    (y, x), (dy, dx) = position, (-1, 0)
+    seen = set()
+    while 0 <= y < height and 0 <= x < width:
+        if (y, x, dy, dx) in seen:
+            return False
+        seen.add((y, x, dy, dx))
+        ny, nx = y + dy, x + dx
+        if 0 <= ny < height and 0 <= nx < width and rows[ny][nx] == ord('#'):
+            dy, dx = dx, -dy
+        else:
+            y, x = ny, nx
+    return True
+
+def day6(scale, rng):
+    # part 1 can't cope with the guard looping on the original map, so keep rolling until it walks off
+    while True:
+        rows = random_rows(rng, scale, scale, {'.': 0.97, '#': 0.03})
+        position = (rng.randrange(scale), rng.randrange(scale))
+        rows[position[0]][position[1]] = ord('^')
+        if guard_escapes(rows, position):
+            return join_rows(rows)
+
+def day7(scale, rng):
+    lines = []
+    while len(lines) < scale:
+        values = [rng.randrange(1, 100) for _ in range(rng.randrange(2, 9))]
+        operators = ('+', '*', '||') if rng.random() < 0.5 else ('+', '*')
+        target = values[0]
+        for v in values[1:]:
+            match rng.choice(operators):
+                case '+':
+                    target += v
+                case '*':
+                    target *= v
+                case '||':
+                    target = int(f"{target}{v}")
+
+        # keep some equations unsolvable
+        if rng.random() < 0.25:
+            target += rng.randrange(1, 10)
+
+        # the solvers divide with floats, so stay well inside what a double represents exactly
+        if target >= 10 ** 14:
+            continue
+        lines.append(f"{target}: {' '.join(str(v) for v in values)}")
+    return ("\n".join(lines) + "\n").encode()
+
+def day8(scale, rng):
+    frequencies = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    rows = [bytearray(b'.' * scale) for _ in range(scale)]
+    for _ in range(max(2, scale * scale // 12)):
+        rows[rng.randrange(scale)][rng.randrange(scale)] = ord(rng.choice(frequencies))
+    return join_rows(rows)
+
+def day9(scale, rng):
+    # file lengths are never 0, but free space can be
+    digits = [str(rng.randrange(1, 10) if i % 2 == 0 else rng.randrange(0, 10)) for i in range(scale | 1)]
+    return ("".join(digits) + "\n").encode()
+
+def day10(scale, rng):
+    # diagonal ridges give plenty of trails, with some noise sprinkled over them to break them up
+    ridge = bytes(ord('0') + abs(i % 18 - 9) for i in range(scale + 18))
+    rows = []
+    for y in range(scale):
+        row = bytearray(ridge[y % 18:y % 18 + scale])
+        for x in rng.sample(range(scale), scale // 5):
+            row[x] = ord('0') + rng.randrange(10)
+        rows.append(row)
+    return join_rows(rows)
+
+def day11(scale, rng):
+    return (" ".join(str(rng.randrange(0, 1000000)) for _ in range(scale)) + "\n").encode()
+
+# a row made of short runs of the same letter, so regions are bigger than a single plot
+def letter_runs(length, rng):
+    letters = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    row = bytearray()
+    while len(row) < length:
+        row += bytes([rng.choice(letters)]) * rng.randrange(1, 7)
+    return row[:length]
+
+def day12(scale, rng):
+    rows = [letter_runs(scale, rng)]
+    while len(rows) < scale:
+        # carry most of the previous row down so regions grow vertically too
+        row = bytearray(rows[-1])
+        start = rng.randrange(scale)
+        end = min(scale, start + rng.randrange(1, scale // 2 + 2))
+        row[start:end] = letter_runs(end - start, rng)
+        rows.append(row)
+    return join_rows(rows)
+
+def day13(scale, rng):
+    machines = []
+    while len(machines) < scale:
+        a = (rng.randrange(10, 100), rng.randrange(10, 100))
+        b = (rng.randrange(10, 100), rng.randrange(10, 100))
+        # the analytic solution needs the buttons to be independent
+        if a[1] * b[0] == a[0] * b[1]:
+            continue
+
+        if rng.random() < 0.5:
+            presses = (rng.randrange(1, 101), rng.randrange(1, 101))
+            prize = (presses[0] * a[0] + presses[1] * b[0], presses[0] * a[1] + presses[1] * b[1])
+        else:
+            prize = (rng.randrange(1000, 20000), rng.randrange(1000, 20000))
+
+        machines.append(f"Button A: X+{a[0]}, Y+{a[1]}\nButton B: X+{b[0]}, Y+{b[1]}\nPrize: X={prize[0]}, Y={prize[1]}")
+    return ("\n\n".join(machines) + "\n").encode()
+
+def day14(scale, rng):
+    # day 14 always uses the full 101 x 103 space
+    width, height = 101, 103
+
+    # part 2 searches for a long horizontal run of robots, so plant one at a known time and work backwards from there
+    tree_time = rng.randrange(100, 10000)
+    tree_row = rng.randrange(height)
+    tree_length = min(scale, 30)
+    tree_start = rng.randrange(width - tree_length)
+
+    final_positions = [(tree_start + i, tree_row) for i in range(tree_length)]
+    while len(final_positions) < scale:
+        # keep everyone else off the tree's row so they can't break it up
+        y = rng.randrange(height - 1)
+        final_positions.append((rng.randrange(width), y if y < tree_row else y + 1))
+
+    lines = []
+    for (x, y) in final_positions:
+        v = (rng.choice((-1, 1)) * rng.randrange(1, 100), rng.choice((-1, 1)) * rng.randrange(1, 100))
+        p = ((x - tree_time * v[0]) % width, (y - tree_time * v[1]) % height)
+        lines.append(f"p={p[0]},{p[1]} v={v[0]},{v[1]}")
+    rng.shuffle(lines)
+    return ("\n".join(lines) + "\n").encode()
+
+def day15(scale, rng):
+    rows = random_rows(rng, scale, scale, {'.': 0.75, 'O': 0.2, '#': 0.05})
+    for y in range(scale):
+        rows[y][0] = rows[y][-1] = ord('#')
+    rows[0][:] = rows[-1][:] = b'#' * scale
+
+    # the robot needs somewhere to stand
+    while True:
+        (x, y) = (rng.randrange(1, scale - 1), rng.randrange(1, scale - 1))
+        if rows[y][x] == ord('.'):
+            rows[y][x] = ord('@')
+            break
+
+    # the real input is a 50 x 50 map with 20000 moves, so keep that ratio of moves to cells
+    moves = rng.randbytes(8 * scale * scale).translate(weighted_table({'<': 1, '^': 1, '>': 1, 'v': 1}))
+    move_lines = [moves[i:i + 1000] for i in range(0, len(moves), 1000)]
+    return join_rows(rows) + b"\n" + b"\n".join(move_lines) + b"\n"
+
+# carves a perfect maze (exactly one route between any two free cells) into an odd-sized grid of walls
+def carve_maze(scale, rng):
+    size = scale | 1
+    rows = [bytearray(b'#' * size) for _ in range(size)]
+    rows[1][1] = ord('.')
+    stack = [(1, 1)]
+    while len(stack) > 0:
+        (x, y) = stack[-1]
+        options = [(dx, dy) for (dx, dy) in ((2, 0), (-2, 0), (0, 2), (0, -2)) if 0 < x + dx < size - 1 and 0 < y + dy < size - 1 and rows[y + dy][x + dx] == ord('#')]
+        if len(options) == 0:
+            stack.pop()
+            continue
+        (dx, dy) = rng.choice(options)
+        rows[y + dy // 2][x + dx // 2] = ord('.')
+        rows[y + dy][x + dx] = ord('.')
+        stack.append((x + dx, y + dy))
+    return rows
+
+def day16(scale, rng):
+    rows = carve_maze(scale, rng)
+    size = len(rows)
+
+    # the real mazes have loops in them, so knock through some walls between corridors
+    for _ in range(size * size // 50):
+        (x, y) = (rng.randrange(1, size - 1), rng.randrange(1, size - 1))
+        horizontal = rows[y][x - 1] == ord('.') and rows[y][x + 1] == ord('.')
+        vertical = rows[y - 1][x] == ord('.') and rows[y + 1][x] == ord('.')
+        if rows[y][x] == ord('#') and horizontal != vertical:
+            rows[y][x] = ord('.')
+
+    rows[size - 2][1] = ord('S')
+    rows[1][size - 2] = ord('E')
+    return join_rows(rows)
+
+# one iteration of the programs we generate for day 17, i.e. what gets output for a given value of A
+def day17_output(a, bxl_1, bxl_2):
+    b = (a % 8) ^ bxl_1
+    return (b ^ bxl_2 ^ (a >> b)) % 8
+
+# the same backwards search that day 17's part 2 does, just to check the program we generate has an answer
+def day17_has_quine(program, bxl_1, bxl_2):
+    candidates = [0]
+    for target in reversed(program):
+        candidates = [c * 8 + d for c in candidates for d in range(8) if day17_output(c * 8 + d, bxl_1, bxl_2) == target]
+        if len(candidates) == 0:
+            return False
+    return True
+
+def day17(scale, rng):
+    # the same shape as the real programs, which is the shape day 17's part 2 analysis relies on
+    while True:
+        bxl_1, bxl_2 = rng.randrange(8), rng.randrange(8)
+        program = [2, 4, 1, bxl_1, 7, 5, 1, bxl_2, 4, rng.randrange(8), 5, 5, 0, 3, 3, 0]
+        if day17_has_quine(program, bxl_1, bxl_2):
+            break
+
+    a = rng.randrange(8 ** (scale - 1), 8 ** scale)
+    return f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\nProgram: {','.join(str(v) for v in program)}\n".encode()
+
+def day18_path_exists(corrupted, size):
+    seen = {(0, 0)}
+    frontier = [(0, 0)]
+    while len(frontier) > 0:
+        (x, y) = frontier.pop()
+        if (x, y) == (size - 1, size - 1):
+            return True
+        for (nx, ny) in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < size and 0 <= ny < size and (nx, ny) not in corrupted and (nx, ny) not in seen:
+                seen.add((nx, ny))
+                frontier.append((nx, ny))
+    return False
+
+def day18(scale, rng):
+    # day 18 always uses the full 71 x 71 space and drops the first 1024 bytes for part 1
+    size = 71
+    cells = [(x, y) for y in range(size) for x in range(size) if (x, y) not in ((0, 0), (size - 1, size - 1))]
+    count = max(1025, min(scale, len(cells)))
+    while True:
+        rng.shuffle(cells)
+        if day18_path_exists(set(cells[:1024]), size):
+            return ("\n".join(f"{x},{y}" for (x, y) in cells[:count]) + "\n").encode()
+
+def day19(scale, rng):
+    colours = "wubrg"
+    towels = set()
+    while len(towels) < 400:
+        towels.add("".join(rng.choice(colours) for _ in range(rng.randrange(1, 9))))
+    # leave one single colour out, otherwise every pattern is trivially possible
+    towels.discard(rng.choice(colours))
+    towels = sorted(towels)
+
+    patterns = []
+    for _ in range(scale):
+        pattern = ""
+        length = rng.randrange(20, 60)
+        while len(pattern) < length:
+            pattern += rng.choice(towels)
+        if rng.random() < 0.3:
+            i = rng.randrange(len(pattern))
+            pattern = pattern[:i] + rng.choice(colours) + pattern[i + 1:]
+        patterns.append(pattern)
+
+    return (", ".join(towels) + "\n\n" + "\n".join(patterns) + "\n").encode()
+
+def day20(scale, rng):
+    rows = carve_maze(scale, rng)
+    size = len(rows)
+    rows[size - 2][1] = ord('S')
+    rows[1][size - 2] = ord('E')
+    return join_rows(rows)
+
+GENERATORS = {day: globals()[f"day{day}"] for day in SCALE_UNITS}
+
+def generate(day, scale, seed=0):
+    return GENERATORS[day](scale, random.Random(f"{day}:{scale}:{seed}"))
@@ -0,0 +1,122 @@
+# a dense grid of single-byte cells, shared by all the grid days
+# every cell lives in one contiguous bytearray (row-major), rather than lists of lists of Enums or linked-up Node objects,
+# so a 10^4 x 10^4 grid is ~100 MB instead of gigabytes of Python objects
+#
+# cells are addressed by a flat index, and the grid is surrounded by `pad` cells of a border value on every side
+# that means stepping off the edge (up to `pad` cells) just lands on the border, rather than needing bounds checks
+# or wrapping round to the other side of the row like negative list indices do
+#
+#     index = (y + pad) * stride + (x + pad)
+#     neighbours are index - stride (up), index + 1 (right), index + stride (down), index - 1 (left)
+#
+# cells hold whatever byte the input had there (e.g. ord('#')), so days can compare against their characters directly
+
+from aoc.inputs import read_grid
+
+class Grid:
+    def __init__(self, width, height, fill=b'.', pad=1, border=b'\0'):
+        self.width = width
+        self.height = height
+        self.pad = pad
+        self.stride = width + 2 * pad
+        self.border = border[0]
+        self.cells = bytearray(border * (self.stride * (height + 2 * pad)))
+
+        if fill is not None:
+            for y in range(height):
+                start = self.index(0, y)
+                self.cells[start:start + width] = fill * width
+
+        # in clockwise order, so turning right is just stepping to the next one
+        self.up, self.right, self.down, self.left = -self.stride, 1, self.stride, -1
+        self.directions = (self.up, self.right, self.down, self.left)
+
+    # takes rows laid out back to back with a newline after each, i.e. what read_grid hands back
+    @staticmethod
+    def from_buffer(data, width, height, pad=1, border=b'\0'):
+        grid = Grid(width, height, fill=None, pad=pad, border=border)
+        source = memoryview(data)
+        for y in range(height):
+            start = grid.index(0, y)
+            grid.cells[start:start + width] = source[y * (width + 1):y * (width + 1) + width]
+        return grid
+
+    @staticmethod
+    def from_lines(lines, pad=1, border=b'\0'):
+        # assume the lines aren't ragged
+        grid = Grid(len(lines[0]), len(lines), fill=None, pad=pad, border=border)
+        for (y, line) in enumerate(lines):
+            start = grid.index(0, y)
+            grid.cells[start:start + grid.width] = line.encode() if isinstance(line, str) else line
+        return grid
+
+    @staticmethod
+    def read(source=None, pad=1, border=b'\0'):
+        return Grid.from_buffer(*read_grid(source), pad=pad, border=border)
+
+    def copy(self):
+        grid = Grid(self.width, self.height, fill=None, pad=self.pad, border=bytes([self.border]))
+        grid.cells[:] = self.cells
+        return grid
+
+    def index(self, x, y):
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def coords(self, index):
+        (y, x) = divmod(index, self.stride)
+        return x - self.pad, y - self.pad
+
+    def on_grid(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __setitem__(self, index, value):
+        self.cells[index] = value
+
+    def get(self, x, y):
+        return self.cells[self.index(x, y)]
+
+    def set(self, x, y, value):
+        self.cells[self.index(x, y)] = value
+
+    # zero-copy views onto a row or column - writes through them land in the grid
+    def row(self, y):
+        start = self.index(0, y)
+        return memoryview(self.cells)[start:start + self.width]
+
+    def column(self, x):
+        start = self.index(x, 0)
+        return memoryview(self.cells)[start:start + self.height * self.stride:self.stride]
+
+    # every index inside the grid (i.e. not the border), in reading order
+    def indices(self):
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def find(self, value):
+        return self.cells.find(bytes([value]))
+
+    def find_all(self, value):
+        found = []
+        needle = bytes([value])
+        index = self.cells.find(needle)
+        while index != -1:
+            found.append(index)
+            index = self.cells.find(needle, index + 1)
+        return found
+
+    def __str__(self):
+        return "\n".join(str(self.row(y), 'latin-1') for y in range(self.height))
+
+    # the grid as a (height, width) NumPy array viewing the same memory, or with padded=True including the border
+    # NumPy is only needed by the vectorised solvers, so it's imported here rather than for everyone
+    def array(self, padded=False):
+        import numpy as np
+
+        full = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height + 2 * self.pad, self.stride)
+        if padded:
+            return full
+        return full[self.pad:self.pad + self.height, self.pad:self.pad + self.width]
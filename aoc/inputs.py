@@ -0,0 +1,124 @@
+# reads a whole puzzle input in one go, rather than an input() call (and a try/except EOFError) per line
+# source is either None (stdin), a path (which gets memory-mapped), or an already-open file
+# the days pick whichever shape suits them: raw bytes (e.g. for regexes), text, lines, blank-line-separated sections, or a 2D buffer
+
+import mmap
+import os
+import sys
+
+def read_bytes(source=None):
+    if source is None:
+        return sys.stdin.buffer.read()
+
+    if hasattr(source, 'read'):
+        data = source.read()
+        return data.encode() if isinstance(data, str) else data
+
+    with open(source, 'rb') as f:
+        # mmap refuses to map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        # the mapping stays valid after the file is closed, and pages are only read in as they're touched
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def read_text(source=None):
+    return str(read_bytes(source), 'ascii')
+
+def read_lines(source=None):
+    return read_text(source).splitlines()
+
+# splits the input on blank lines, e.g. day 5's rules and updates, or day 15's map and moves
+def read_sections(source=None):
+    return [section.splitlines() for section in read_text(source).replace('\r\n', '\n').split('\n\n')]
+
+# for grids, hand back the bytes as they are along with their dimensions, rather than splitting them into lines
+# row y lives at data[y * (width + 1):y * (width + 1) + width], i.e. each row is followed by its newline
+def read_grid(source=None):
+    data = read_bytes(source)
+    width = data.find(b'\n')
+    if width == -1:
+        width = len(data)
+
+    # the last line might not have a newline after it
+    stride = width + 1
+    height = (len(data) + 1) // stride
+    if len(data) not in (height * stride, height * stride - 1):
+        raise Exception(f"Grid is not rectangular: {len(data)} bytes with rows of width {width}")
+
+    # spot-check the rows line up rather than scanning the whole thing, which would defeat the point of mapping it
+    for y in (0, height // 2, height - 2):
+        if 0 <= y < height - 1 and data[y * stride + width] != ord('\n'):
+            raise Exception(f"Grid row {y} is not {width} wide")
+
+    return data, width, height
+
+# every whitespace-separated integer in the input as one int64 NumPy array, parsed in C rather than making a Python object per number
+# NumPy is only needed by the vectorised solvers, so it's imported here rather than for everyone
+def read_ints_numpy(source=None):
+    import numpy as np
+
+    data = read_bytes(source)
+    # fromstring won't take a memory map, so this is the one place a mapped input gets copied
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    # (anything that isn't a number makes this raise, rather than quietly stopping early)
+    return np.fromstring(data, dtype=np.int64, sep=' ')
+
+# one row of integers per line (e.g. day 2's reports) as a ragged array: every number in one flat int64 array, plus the
+# offset each row starts at, so row r is values[offsets[r]:offsets[r + 1]]. blank lines don't count as rows
+def read_int_rows_numpy(source=None):
+    import numpy as np
+
+    data = read_bytes(source)
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    values = np.fromstring(data, dtype=np.int64, sep=' ')
+
+    # count where each number starts, and how many have started by the end of each line
+    raw = np.frombuffer(data, dtype=np.uint8)
+    in_number = ((raw >= ord('0')) & (raw <= ord('9'))) | (raw == ord('-'))
+    starts = in_number & ~np.concatenate(([False], in_number[:-1]))
+    ends = np.flatnonzero(raw == ord('\n'))
+    if len(raw) > 0 and raw[-1] != ord('\n'):
+        ends = np.append(ends, len(raw))
+    started = np.concatenate(([0], np.cumsum(starts)))
+    # blank lines start at the same offset as the line after them, so dropping repeats drops them
+    offsets = np.unique(np.concatenate(([0], started[ends])))
+    if offsets[-1] != len(values):
+        raise Exception(f"Found {offsets[-1]} numbers across the lines but parsed {len(values)}")
+    return values, offsets
+
+# for inputs too big to hold at once: the input a block of at most size bytes at a time, read as it's needed
+# blocks split wherever they happen to, so a caller after lines or numbers has to carry the tail of each block over to the next
+CHUNK_SIZE = 1 << 20
+
+def iter_chunks(source=None, size=CHUNK_SIZE):
+    if source is None:
+        f = sys.stdin.buffer
+    elif hasattr(source, 'read'):
+        f = source
+    else:
+        with open(source, 'rb') as f:
+            yield from iter_chunks(f, size)
+        return
+
+    # read1 hands back whatever's already arrived (up to size) rather than waiting for all size bytes, so a pipe gets
+    # processed as it's written to rather than a block at a time
+    read = getattr(f, 'read1', f.read)
+    while True:
+        chunk = read(size)
+        if not chunk:
+            return
+        yield chunk.encode() if isinstance(chunk, str) else chunk
+
+# the input a line at a time (without the line endings), as it's read
+def iter_lines(source=None):
+    tail = b''
+    for chunk in iter_chunks(source):
+        lines = (tail + chunk).split(b'\n')
+        # the last piece is either empty or a line that carries on into the next chunk
+        tail = lines.pop()
+        for line in lines:
+            yield str(line.rstrip(b'\r'), 'ascii')
+    if tail:
+        yield str(tail.rstrip(b'\r'), 'ascii')
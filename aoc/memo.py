@@ -0,0 +1,132 @@
+# memo tables with a cap on how many entries they keep, for solvers that memoise at module level
+# in a one-shot run a plain dict is fine, but in a long-running process (see aoc.daemon) the memos outlive each input
+# and would otherwise grow forever - so entries go in one of two generations of up to half the cap each. when the
+# current one fills up the older one is thrown away wholesale and a fresh one started, so anything still being looked
+# up survives by being moved into the new generation on its first hit there. that's close to least-recently-used, but
+# with no bookkeeping on a hit: the memo is itself a dict holding the current generation, so memo[key] is a plain dict
+# lookup, and only a key that isn't there falls through to __missing__ to check the older generation
+#
+# every memo is registered by name (day.function, like trace channels), so the daemon can report how well each is doing:
+#     memo = bounded_memo('day11.stones_for_count', max_entries=1_000_000)
+#     ...
+#     val = memo[key]
+#     if val is not MISSING:
+#         return val
+#
+# counting hits would put a python call back on every lookup, so only memos created after count_hits() (which the
+# daemon does before importing any days) count them - otherwise hits and the hit rate are reported as None
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# stands in for "not memoised" so that None can still be memoised
+MISSING = object()
+
+memos = {}
+
+COUNT_HITS = False
+
+def check_max_entries(max_entries):
+    if max_entries < 2:
+        raise Exception(f"A memo needs room for at least one entry per generation, so can't be capped at {max_entries}")
+
+class BoundedMemo(dict):
+    # attributes on a dict subclass are slow to get at without these, and the miss path goes through several
+    __slots__ = ('name', 'max_entries', 'previous', 'room', 'hits', 'misses', 'evictions')
+
+    def __init__(self, name, max_entries):
+        super().__init__()
+        check_max_entries(max_entries)
+        self.name = name
+        self.max_entries = max_entries
+        self.previous = {}
+        self.room = max_entries // 2
+        self.hits = None
+        self.misses = 0
+        self.evictions = 0
+
+    # only called for keys that aren't in the current generation. storing is left as dict's own, so this is also where
+    # the generation's room gets counted down - memoising always misses before it stores, so it can't get past the cap.
+    # that does mean only looking up keys that will be stored on a miss: a lookup that's never followed by a store
+    # (e.g. for a base case that isn't memoised) still uses up room, and counts as a miss
+    def __missing__(self, key):
+        value = self.previous.pop(key, MISSING) if self.previous else MISSING
+        if value is MISSING:
+            self.misses += 1
+        else:
+            # still in use, so keep it for the next generation
+            self[key] = value
+        self.room -= 1
+        if self.room <= 0:
+            self.next_generation()
+        return value
+
+    def get(self, key, default=None):
+        value = self[key]
+        return default if value is MISSING else value
+
+    def next_generation(self):
+        self.evictions += len(self.previous)
+        self.previous = dict(self)
+        dict.clear(self)
+        self.room = self.max_entries // 2
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.previous)
+
+    # shrinking below what's held throws away whole generations, oldest first
+    def resize(self, max_entries):
+        check_max_entries(max_entries)
+        self.max_entries = max_entries
+        generation = self.max_entries // 2
+        while len(self.previous) > generation or dict.__len__(self) >= generation:
+            self.next_generation()
+        self.room = min(self.room, generation - dict.__len__(self))
+
+    def clear(self):
+        dict.clear(self)
+        self.previous.clear()
+        self.room = self.max_entries // 2
+
+    def stats(self):
+        lookups = self.hits + self.misses if self.hits is not None else 0
+        return {
+            'entries': len(self),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups > 0 else None,
+        }
+
+class CountingMemo(BoundedMemo):
+    __slots__ = ()
+
+    def __init__(self, name, max_entries):
+        super().__init__(name, max_entries)
+        self.hits = 0
+
+    def __getitem__(self, key):
+        # dict's own lookup, which still falls through to __missing__
+        value = dict.__getitem__(self, key)
+        if value is not MISSING:
+            self.hits += 1
+        return value
+
+def bounded_memo(name, max_entries=None):
+    if name not in memos:
+        memos[name] = (CountingMemo if COUNT_HITS else BoundedMemo)(name, max_entries or DEFAULT_MAX_ENTRIES)
+    return memos[name]
+
+# caps every memo, including any created after this (e.g. by a day that hasn't been imported yet)
+def resize_all(max_entries):
+    global DEFAULT_MAX_ENTRIES
+    DEFAULT_MAX_ENTRIES = max_entries
+    for memo in memos.values():
+        memo.resize(max_entries)
+
+def count_hits():
+    global COUNT_HITS
+    COUNT_HITS = True
+
+def stats():
+    return {name: memo.stats() for (name, memo) in sorted(memos.items())}
@@ -0,0 +1,105 @@
+# profiles each phase of a day separately, so a slow day can be looked into without editing it to add profiling
+# for every phase this writes:
+#     dayN-PHASE.pstats     - cProfile output, for pstats/snakeviz/etc (python -m pstats dayN-part2.pstats)
+#     dayN-PHASE-alloc.txt  - the phase's peak traced memory, then the top lines by memory held at the biggest point we
+#                             caught it at, then the top lines by memory still held once it's done
+#
+# tracemalloc can only tell us what's allocated right now, so memory that's allocated and thrown away inside the phase
+# (e.g. a deepcopy per move) would never show up in a before/after comparison. a background thread samples the phase
+# every SAMPLE_INTERVAL seconds and keeps a snapshot from the biggest sample, which catches those
+#
+# both profilers slow things down a lot, so timings from a profiled run aren't worth comparing against ones without
+
+import cProfile
+import os
+import threading
+import tracemalloc
+
+SAMPLE_INTERVAL = 0.05
+
+class PeakSampler(threading.Thread):
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.largest = -1
+        self.snapshot = None
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self.largest:
+                self.largest = current
+                self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+class PhaseProfiler:
+    def __init__(self, directory, day, top=10, memory=True):
+        self.directory = directory
+        self.day = day
+        self.top = top
+        self.memory = memory
+        self.written = []
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, phase, suffix):
+        return os.path.join(self.directory, f"day{self.day}-{phase}{suffix}")
+
+    def run(self, phase, fn, *args):
+        # tracemalloc might already be on (e.g. the runner tracking peak memory), in which case leave it on afterwards
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            if self.memory:
+                tracemalloc.reset_peak()
+                before = tracemalloc.take_snapshot()
+                baseline = tracemalloc.get_traced_memory()[0]
+                sampler = PeakSampler()
+                sampler.start()
+
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                value = fn(*args)
+            finally:
+                profile.disable()
+                if self.memory:
+                    sampler.stop()
+
+            profile.dump_stats(self.path(phase, '.pstats'))
+            self.written.append(self.path(phase, '.pstats'))
+
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                after = tracemalloc.take_snapshot()
+                # phases shorter than one sample just report what they left behind
+                largest = sampler.snapshot.compare_to(before, 'lineno') if sampler.snapshot is not None else None
+                self.write_allocations(phase, peak, sampler.largest - baseline, largest, after.compare_to(before, 'lineno'))
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return value
+
+    def write_allocations(self, phase, peak, sampled, largest, retained):
+        with open(self.path(phase, '-alloc.txt'), 'w') as f:
+            print(f"day {self.day} {phase}: peak {peak} bytes above the start of the phase", file=f)
+            if largest is not None:
+                print(f"\ntop {self.top} lines at the biggest sample ({sampled} bytes above the start of the phase):", file=f)
+                self.write_top(f, largest)
+            print(f"\ntop {self.top} lines by memory still allocated at the end of the phase:", file=f)
+            self.write_top(f, retained)
+        self.written.append(self.path(phase, '-alloc.txt'))
+
+    def write_top(self, f, differences):
+        # skip the profilers' own bookkeeping, which would otherwise crowd out the solver's lines
+        ignored = (tracemalloc.__file__, cProfile.__file__, threading.__file__, __file__)
+        differences = [d for d in differences if d.size_diff > 0 and d.traceback[0].filename not in ignored]
+        differences.sort(key=lambda d: d.size_diff, reverse=True)
+        for difference in differences[:self.top]:
+            print(f"  {difference}", file=f)
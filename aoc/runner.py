@@ -0,0 +1,113 @@
+# imports a day's module and drives its accept_input/part1/part2 functions, timing each phase separately
+# every day follows the same shape, so this just needs to know how to get the parsed input into the parts
+
+import importlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from aoc.cache import code_version, file_hash, input_hash
+from aoc.inputs import read_bytes
+
+# the repo root, so the dayN packages are importable however we were launched
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+PHASES = ('parse', 'part1', 'part2')
+
+def load_day(day):
+    return importlib.import_module(f"day{day}.day{day}")
+
+# some days have more than one way of solving them (e.g. a vectorised one, for big inputs), chosen by name
+# mode 'numpy' looks for accept_input_numpy, part1_numpy and part2_numpy, using the plain version of any it doesn't have
+def solver_functions(module, mode=None):
+    names = ('accept_input', 'part1', 'part2')
+    if mode is None:
+        return tuple(getattr(module, name) for name in names)
+
+    if not any(hasattr(module, f"{name}_{mode}") for name in names):
+        raise Exception(f"{module.__name__} has no {mode} mode")
+    return tuple(getattr(module, f"{name}_{mode}", None) or getattr(module, name) for name in names)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+# runs one phase, optionally recording how far the phase pushed allocated memory above where it started
+# tracemalloc slows everything down a lot, so timings taken with it on aren't worth comparing against ones without
+# with a profiler, the phase runs under it instead (see aoc.profiling)
+def run_phase(result, phase, fn, *args, profiler=None):
+    if profiler is not None:
+        value, result['timings'][phase] = timed(profiler.run, phase, fn, *args)
+    elif tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        value, result['timings'][phase] = timed(fn, *args)
+        result['peak_memory'][phase] = tracemalloc.get_traced_memory()[1] - baseline
+    else:
+        value, result['timings'][phase] = timed(fn, *args)
+    return value
+
+# with a cache, any part it already has the answer to (for this input and this version of the code) isn't solved again,
+# and if it has both, the input isn't even parsed
+def solve_day(day, source=None, track_memory=False, cache=None, profiler=None, mode=None):
+    module = load_day(day)
+    (accept_input, part1, part2) = solver_functions(module, mode)
+    result = {'day': day, 'timings': {}}
+    if mode is not None:
+        result['mode'] = mode
+
+    if track_memory:
+        result['peak_memory'] = {}
+        tracemalloc.start()
+
+    cached = {}
+    if cache is not None:
+        start = time.perf_counter()
+        if isinstance(source, (str, os.PathLike)):
+            # a file can be hashed a chunk at a time and then read again by the parse, which still gets the path - so the
+            # out-of-core and memory-mapping modes (and their workers) see it just as they would without a cache
+            digest = file_hash(source)
+        else:
+            # stdin or an open file can only be read once, so the parse works from the bytes read here to hash it
+            data = read_bytes(source)
+            digest = input_hash(data)
+            source = io.BytesIO(data)
+        # each mode is its own code, so its answers are kept apart from the plain version's (and any other mode's)
+        version = code_version(module) if mode is None else f"{code_version(module)}:{mode}"
+        for part in ('part1', 'part2'):
+            (hit, value) = cache.get(day, part, digest, version)
+            if hit:
+                cached[part] = value
+        result['cached'] = sorted(cached)
+        result['timings']['cache'] = time.perf_counter() - start
+
+    try:
+        if len(cached) == 2:
+            result.update(cached)
+            result['timings'].update(parse=0.0, part1=0.0, part2=0.0)
+            return result
+
+        parsed = run_phase(result, 'parse', accept_input, source, profiler=profiler)
+
+        # some days hand back several values (e.g. rules and updates), which the parts take as separate arguments
+        args = parsed if isinstance(parsed, tuple) else (parsed,)
+
+        for (part, fn) in (('part1', part1), ('part2', part2)):
+            if part in cached:
+                result[part] = cached[part]
+                result['timings'][part] = 0.0
+                continue
+
+            result[part] = run_phase(result, part, fn, *args, profiler=profiler)
+            if cache is not None:
+                cache.put(day, part, digest, version, result[part])
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+
+    return result
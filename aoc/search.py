@@ -0,0 +1,185 @@
+# shortest-path searches shared by the maze days
+# states are plain ints in range(n) (e.g. a grid index, or index * 4 + direction when facing matters), so distances and
+# predecessors live in two preallocated arrays rather than dicts keyed by tuples, and the queues only ever hold ints
+#
+# every search takes a neighbours function from a state to the states it can step to:
+#     bfs:               neighbours(state) -> iterable of next states (every step costs 1)
+#     dijkstra / astar:  neighbours(state) -> iterable of (next state, cost)
+# and sources, so several starting points can be searched from at once (e.g. every peak in day 10)
+# for dijkstra/astar sources can also be a dict of {state: starting distance} (e.g. every way of facing at the start in day 16)
+#
+# passing goals stops the search as soon as the first of them is settled; otherwise it covers everything reachable
+# (or, for dijkstra/astar, everything no further away than limit)
+
+from array import array
+from heapq import heappop, heappush
+
+# anything unreached is left at this distance (the biggest value the distance array holds)
+INFINITY = 2 ** 63 - 1
+
+class SearchResult:
+    def __init__(self, n):
+        self.dist = array('q', [INFINITY]) * n
+        self.pred = array('q', [-1]) * n
+        # states in the order they were settled, i.e. in order of distance
+        self.order = []
+        # the goal the search stopped at, if any
+        self.goal = None
+
+    def reached(self, state):
+        return self.dist[state] != INFINITY
+
+    # the states from a source to the given state (inclusive), or None if it was never reached
+    def path(self, state):
+        if not self.reached(state):
+            return None
+
+        path = [state]
+        while self.pred[state] != -1:
+            state = self.pred[state]
+            path.append(state)
+        path.reverse()
+        return path
+
+def starting_distances(sources):
+    if isinstance(sources, dict):
+        return sources.items()
+    return ((s, 0) for s in sources)
+
+# every step costs the same, so the queue is just a list that we read along - which also makes it the settle order
+def bfs(n, sources, neighbours, goals=()):
+    result = SearchResult(n)
+    dist, pred = result.dist, result.pred
+    goals = set(goals)
+
+    # every source starts at distance 0 - different starting distances need one of the searches below
+    queue = result.order
+    for state in sources:
+        if dist[state] == INFINITY:
+            dist[state] = 0
+            queue.append(state)
+
+    head = 0
+    while head < len(queue):
+        state = queue[head]
+        head += 1
+        if state in goals:
+            result.goal = state
+            # anything still queued was never settled
+            del queue[head:]
+            break
+
+        next_distance = dist[state] + 1
+        for next_state in neighbours(state):
+            if dist[next_state] == INFINITY:
+                dist[next_state] = next_distance
+                pred[next_state] = state
+                queue.append(next_state)
+
+    return result
+
+# with max_cost set (every cost an int from 0 up to max_cost), the heap is swapped for a bucket queue: a ring of max_cost + 1
+# lists, where bucket d % (max_cost + 1) holds everything queued at distance d. since nothing can be queued more than max_cost
+# past the distance we're settling, the ring never wraps onto itself, and pushing/popping is just list appends and pops
+def dijkstra(n, sources, neighbours, goals=(), max_cost=None, limit=None):
+    if max_cost is not None:
+        return bucket_dijkstra(n, sources, neighbours, goals, max_cost, limit)
+    return astar(n, sources, neighbours, None, goals, limit)
+
+def bucket_dijkstra(n, sources, neighbours, goals, max_cost, limit=None):
+    result = SearchResult(n)
+    dist, pred, order = result.dist, result.pred, result.order
+    goals = set(goals)
+    settled = bytearray(n)
+    if limit is None:
+        limit = INFINITY
+
+    ring = max_cost + 1
+    buckets = [[] for _ in range(ring)]
+    queued = 0
+    # sources can start further apart than the ring covers, so they wait here (furthest first, so the nearest pops off
+    # the end) until the distance we're settling comes within max_cost of them
+    starts = list(starting_distances(sources))
+    for (state, d) in starts:
+        if d < dist[state]:
+            dist[state] = d
+    pending = sorted(((d, state) for (state, d) in starts if dist[state] == d), reverse=True)
+    distance = pending[-1][0] if pending else INFINITY
+
+    while (queued > 0 or pending) and distance <= limit:
+        # with nothing in the ring, skip straight ahead to the next source
+        if queued == 0 and pending[-1][0] > distance:
+            distance = pending[-1][0]
+            continue
+        while pending and pending[-1][0] <= distance + max_cost:
+            (d, state) = pending.pop()
+            buckets[d % ring].append(state)
+            queued += 1
+
+        slot = distance % ring
+        bucket = buckets[slot]
+        if not bucket:
+            distance += 1
+            continue
+
+        # take the whole bucket at once - anything reached at no extra cost lands in the fresh one and gets picked up next time round
+        buckets[slot] = []
+        queued -= len(bucket)
+        for state in bucket:
+            # stale entries are left behind when a state is improved, rather than finding and removing them
+            if settled[state] or dist[state] != distance:
+                continue
+            settled[state] = 1
+            order.append(state)
+
+            if state in goals:
+                result.goal = state
+                return result
+
+            for (next_state, cost) in neighbours(state):
+                next_distance = distance + cost
+                if next_distance < dist[next_state]:
+                    dist[next_state] = next_distance
+                    pred[next_state] = state
+                    buckets[next_distance % ring].append(next_state)
+                    queued += 1
+
+    return result
+
+# heuristic(state) must never overestimate the remaining distance to the nearest goal (and should be consistent), or
+# the first route found might not be the shortest. with no heuristic this is just Dijkstra
+def astar(n, sources, neighbours, heuristic, goals=(), limit=None):
+    result = SearchResult(n)
+    dist, pred, order = result.dist, result.pred, result.order
+    goals = set(goals)
+    settled = bytearray(n)
+
+    # the heap holds (estimated total, distance so far, state) - all ints, so no tiebreak counter is needed
+    heap = []
+    for (state, d) in starting_distances(sources):
+        if d < dist[state]:
+            dist[state] = d
+            heappush(heap, (d + (heuristic(state) if heuristic else 0), d, state))
+
+    while heap:
+        (_, distance, state) = heappop(heap)
+        if limit is not None and distance > limit:
+            break
+        if settled[state] or dist[state] != distance:
+            continue
+        settled[state] = 1
+        order.append(state)
+
+        if state in goals:
+            result.goal = state
+            break
+
+        for (next_state, cost) in neighbours(state):
+            next_distance = distance + cost
+            if next_distance < dist[next_state]:
+                dist[next_state] = next_distance
+                pred[next_state] = state
+                estimate = next_distance + (heuristic(next_state) if heuristic else 0)
+                heappush(heap, (estimate, next_distance, next_state))
+
+    return result
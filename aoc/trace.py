@@ -0,0 +1,92 @@
+# named trace channels for the debug output the solvers used to print unconditionally
+# channels are named day.function (e.g. day5.valid_update), and enabling a prefix turns on everything under it
+# so enable('day5') gets every channel in day 5, enable('day5.valid_update') just that one, and enable('*') everything
+#
+# call sites check channel.enabled themselves before doing anything:
+#     valid_update_trace = channel('day5.valid_update')
+#     ...
+#     if valid_update_trace.enabled:
+#         valid_update_trace(f"{v} must appear before {prohibited_values}")
+# so with tracing off the hot loop pays for one attribute lookup, and the message never even gets formatted
+#
+# channels can be switched on from the runner (--trace day5) or with AOC_TRACE=day5,day7 in the environment
+
+from collections import defaultdict
+import fnmatch
+import os
+import sys
+import time
+
+channels = {}
+enabled_patterns = []
+
+class Channel:
+    def __init__(self, name):
+        self.name = name
+        self.enabled = matches_enabled(name)
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+
+    def __call__(self, message):
+        print(f"[{self.name}] {message}", file=sys.stderr)
+
+    def count(self, key, amount=1):
+        self.counters[key] += amount
+
+    def timer(self, key):
+        return ChannelTimer(self, key)
+
+class ChannelTimer:
+    def __init__(self, channel, key):
+        self.channel = channel
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.channel.timers[self.key] += time.perf_counter() - self.start
+
+def matches_enabled(name):
+    for pattern in enabled_patterns:
+        if name == pattern or name.startswith(pattern + '.') or fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+# channels are created at import time, usually before anyone has asked for tracing, so they're registered here and
+# flipped on later by enable
+def channel(name):
+    if name not in channels:
+        channels[name] = Channel(name)
+    return channels[name]
+
+def enable(*patterns):
+    enabled_patterns.extend(patterns)
+    for c in channels.values():
+        c.enabled = matches_enabled(c.name)
+
+def disable_all():
+    enabled_patterns.clear()
+    for c in channels.values():
+        c.enabled = False
+
+def reset():
+    for c in channels.values():
+        c.counters.clear()
+        c.timers.clear()
+
+def report(out=None):
+    out = out or sys.stderr
+    for name in sorted(channels):
+        c = channels[name]
+        if not c.enabled or (len(c.counters) == 0 and len(c.timers) == 0):
+            continue
+        print(f"[{name}]", file=out)
+        for (key, value) in sorted(c.counters.items()):
+            print(f"  {key}: {value}", file=out)
+        for (key, value) in sorted(c.timers.items()):
+            print(f"  {key}: {value * 1000:.3f} ms", file=out)
+
+if os.environ.get('AOC_TRACE'):
+    enable(*(p.strip() for p in os.environ['AOC_TRACE'].split(',') if p.strip()))
@@ -0,0 +1,66 @@
+# searching text for many words at once with an Aho-Corasick automaton, so the work per byte of text doesn't depend on
+# how many words there are. the automaton is a trie of the words where every state also knows where to go on any byte,
+# falling back along the longest suffix that's still a prefix of some word when the trie itself has no edge for it
+#
+#     automaton = Automaton(["XMAS", "SAMX", "MAS"])
+#     counts = automaton.count([b"XMASAMX", b"MMASS"])     # {"XMAS": 1, "SAMX": 1, "MAS": 2}
+#
+# rather than walking the suffix links at every byte to find every word ending there (which costs per match), each
+# state just counts how often it's visited. every word ending at a state also ends at every state whose suffix links
+# lead there, so once the text is done the visits get pushed down the suffix links, deepest states first, and each word's
+# count is the total at the state its last byte leads to
+
+from collections import deque
+
+class Automaton:
+    def __init__(self, words):
+        self.words = list(words)
+        # trie edges, as one {byte: state} dict per state, with the root as state 0
+        edges = [{}]
+        self.ends = []
+        for word in self.words:
+            encoded = word.encode() if isinstance(word, str) else word
+            if len(encoded) == 0:
+                raise Exception("Can't search for an empty word")
+            state = 0
+            for byte in encoded:
+                if byte not in edges[state]:
+                    edges[state][byte] = len(edges)
+                    edges.append({})
+                state = edges[state][byte]
+            self.ends.append(state)
+
+        # breadth first, so every state's suffix link (which is always shallower) is worked out before it's needed
+        # each state's moves are its suffix link's moves, overridden by its own trie edges
+        self.links = [0] * len(edges)
+        self.moves = [None] * len(edges)
+        self.moves[0] = dict(edges[0])
+        self.order = [0]
+        queue = deque(edges[0].values())
+        while queue:
+            state = queue.popleft()
+            self.order.append(state)
+            self.moves[state] = {**self.moves[self.links[state]], **edges[state]}
+            for (byte, child) in edges[state].items():
+                # the longest proper suffix of child's prefix is wherever the byte leads from state's suffix
+                # (the root's children can only link back to the root)
+                self.links[child] = self.moves[self.links[state]].get(byte, 0) if state != 0 else 0
+                queue.append(child)
+
+    # how often each state is visited over the texts (bytes-like), ignoring suffix links
+    def visits(self, texts):
+        visits = [0] * len(self.moves)
+        moves = self.moves
+        for text in texts:
+            state = 0
+            for byte in text:
+                state = moves[state].get(byte, 0)
+                visits[state] += 1
+        return visits
+
+    def count(self, texts):
+        visits = self.visits(texts)
+        for state in reversed(self.order):
+            if state != 0:
+                visits[self.links[state]] += visits[state]
+        return {word: visits[end] for (word, end) in zip(self.words, self.ends)}
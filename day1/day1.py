@@ -1,25 +1,25 @@
 # was busy today so just hacking together a quick solution in Python, I'd like to do the rest in Go with some nice test harness but I'll set that up when I'm in less of a rush
 
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-import re
+import heapq
+from itertools import accumulate
+from math import isqrt
+import mmap
+import os
+import tempfile
 
-# grabs the two numbers as two match groups
-extract_number_regex = re.compile(r'(\d+)\s+(\d+)')
+from aoc.inputs import iter_chunks, read_ints_numpy, read_text
 
-def accept_lists():
-    values_1, values_2 = [],[]
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            return values_1, values_2
-            
-        if line.strip() == '':
-            return values_1, values_2
-        match = extract_number_regex.fullmatch(line)
-        v1, v2 = match.group(1,2)
-        values_1.append(int(v1))
-        values_2.append(int(v2))
+# the input is just pairs of numbers, so split the whole thing on whitespace and deal the values out alternately
+def accept_lists(source=None):
+    values = read_text(source).split()
+    return list(map(int, values[0::2])), list(map(int, values[1::2]))
+
+# every other day calls this accept_input, so give the runner the same name to look for
+def accept_input(source=None):
+    return accept_lists(source)
 
 def main():
     values_1, values_2 = accept_lists()
@@ -44,4 +44,309 @@ def part2(values_1, values_2):
         score += v * right_list_occurrences[v]
     return score
 
-main()
\ No newline at end of file
+# vectorised versions (python -m aoc run 1 --mode numpy) for when the lists run to millions of entries
+# the input goes straight into two int64 columns, and then both parts are a handful of whole-array operations
+def accept_input_numpy(source=None):
+    values = read_ints_numpy(source)
+    if len(values) % 2 != 0:
+        raise Exception(f"Expected pairs of numbers, got {len(values)} numbers")
+    # copied so each list is contiguous, rather than a strided view over both
+    return values[0::2].copy(), values[1::2].copy()
+
+def part1_numpy(values_1, values_2):
+    import numpy as np
+
+    return int(np.abs(np.sort(values_1) - np.sort(values_2)).sum())
+
+def part2_numpy(values_1, values_2):
+    import numpy as np
+
+    # count each distinct value on both sides, so the lookups are between two short sorted arrays rather than one per left entry
+    left_values, left_occurrences = np.unique(values_1, return_counts=True)
+    right_values, right_occurrences = np.unique(values_2, return_counts=True)
+    if len(right_values) == 0:
+        return 0
+    positions = np.searchsorted(right_values, left_values)
+    # anything past the end of the right list can't have matched
+    positions[positions == len(right_values)] = 0
+    matches = np.where(right_values[positions] == left_values, right_occurrences[positions], 0)
+    return int((left_values * left_occurrences * matches).sum())
+
+# an out-of-core version (python -m aoc run 1 --mode external) for lists too long to hold in memory, even as int64 arrays
+# the input is streamed through, and each list gets cut into runs of RUN_LENGTH values which are sorted and spilled to
+# temporary files - the parts then k-way merge the runs (read back through memory maps), so the only thing held in
+# memory at once is one value per run
+RUN_LENGTH = 1 << 20
+
+class SortedRuns:
+    def __init__(self):
+        # the directory (and every run in it) is removed once this is garbage collected
+        self.directory = tempfile.TemporaryDirectory(prefix='aoc-day1-')
+        self.paths = []
+        self.pending = array('q')
+        self.count = 0
+
+    def extend(self, values):
+        self.pending.extend(values)
+        while len(self.pending) >= RUN_LENGTH:
+            (self.pending, rest) = (self.pending[:RUN_LENGTH], self.pending[RUN_LENGTH:])
+            self.spill()
+            self.pending = rest
+
+    def spill(self):
+        if len(self.pending) == 0:
+            return
+        run = array('q', sorted(self.pending))
+        path = os.path.join(self.directory.name, f"run{len(self.paths)}")
+        with open(path, 'wb') as f:
+            run.tofile(f)
+        self.paths.append(path)
+        self.count += len(run)
+        self.pending = array('q')
+
+    def __len__(self):
+        return self.count + len(self.pending)
+
+    # every value across all the runs, in sorted order
+    def merged(self):
+        self.spill()
+        maps = []
+        views = []
+        try:
+            for path in self.paths:
+                with open(path, 'rb') as f:
+                    maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                views.append(memoryview(maps[-1]).cast('q'))
+            yield from heapq.merge(*views)
+        finally:
+            # the views have to let go of the maps before they can be closed
+            for view in views:
+                view.release()
+            for m in maps:
+                m.close()
+
+def accept_input_external(source=None):
+    columns = (SortedRuns(), SortedRuns())
+    count = 0
+    tail = b''
+    for chunk in iter_chunks(source):
+        values = (tail + chunk).split()
+        # a chunk that doesn't end on whitespace might have cut a number in half, so hold the last one over to the next
+        tail = values.pop() if values and not chunk[-1:].isspace() else b''
+        values = list(map(int, values))
+        # deal them out alternately, picking up from whichever list the last chunk finished on
+        columns[count % 2].extend(values[0::2])
+        columns[(count + 1) % 2].extend(values[1::2])
+        count += len(values)
+    if tail:
+        columns[count % 2].extend([int(tail)])
+        count += 1
+
+    if count % 2 != 0:
+        raise Exception(f"Expected pairs of numbers, got {count} numbers")
+    for column in columns:
+        column.spill()
+    return columns
+
+def part1_external(runs_1, runs_2):
+    score = 0
+    for v1, v2 in zip(runs_1.merged(), runs_2.merged()):
+        score += abs(v1 - v2)
+    return score
+
+# with both lists in sorted order, equal values come out of each together, so the similarity is one pass over both:
+# each value that's in both lists scores value * (times on the left) * (times on the right)
+def part2_external(runs_1, runs_2):
+    left = runs_1.merged()
+    right = runs_2.merged()
+    score = 0
+    v2 = next(right, None)
+    previous = None
+    right_count = 0
+    for v1 in left:
+        if v1 != previous:
+            previous = v1
+            right_count = 0
+            while v2 is not None and v2 < v1:
+                v2 = next(right, None)
+            while v2 is not None and v2 == v1:
+                right_count += 1
+                v2 = next(right, None)
+        score += v1 * right_count
+    return score
+
+# keeping both answers up to date as the lists change a few entries at a time, rather than starting again on every change
+#
+# the similarity is easy: each value added or removed on one side adds or takes away value * (times it's on the other side)
+# the distance is harder, since adding one value shifts the pairing of everything above it along by one. but pairing the
+# sorted lists off is the same as summing |D(x)| over every integer x, where D(x) = (left values <= x) - (right values <= x),
+# and adding a value to one side just moves D by one for everything from that value up
+#
+# so the distinct values are kept in order, cut into blocks, each with the difference in counts at every value. within a
+# block, D is the block's offset (the counts before it) plus a running total, and each block keeps how much of the number
+# line sits at each running total. moving D by one over a whole block then just needs a lookup, and only the block the
+# value lands in needs going through entry by entry
+#
+# a change costs one lookup per block after it plus one pass over its own block, so blocks are sized to about sqrt(n) of
+# the n distinct values to keep both halves to O(sqrt n). blocks split when they reach twice that, and everything gets
+# cut up again once n has drifted far enough that the size is off by a factor of two (or empty blocks have piled up),
+# which takes O(n) changes to happen so it's O(1) a change spread over them. BLOCK_SIZE is the smallest they get
+BLOCK_SIZE = 256
+
+class Block:
+    def __init__(self, values, deltas, offset):
+        self.values = values
+        self.deltas = deltas
+        self.offset = offset
+
+    # next_value is the first value of the next block, if there is one, which is where this block's last stretch ends
+    def rebuild(self, next_value):
+        self.widths = defaultdict(int)
+        ends = self.values[1:] + ([next_value] if next_value is not None else [])
+        for (running, value, end) in zip(accumulate(self.deltas), self.values, ends):
+            self.widths[running] += end - value
+        self.width = sum(self.widths.values())
+        self.negative = sum(width for (running, width) in self.widths.items() if running + self.offset < 0)
+
+    def distance(self):
+        return sum(width * abs(running + self.offset) for (running, width) in self.widths.items())
+
+    # moves D by change (1 or -1) over the whole block, returning how much that changes the distance by
+    def shift(self, change):
+        if change == 1:
+            # everywhere D >= 0 gets one further away, everywhere it's negative gets one closer
+            difference = self.width - 2 * self.negative
+            self.negative -= self.widths.get(-self.offset - 1, 0)
+        else:
+            zero = self.widths.get(-self.offset, 0)
+            difference = 2 * (self.negative + zero) - self.width
+            self.negative += zero
+        self.offset += change
+        return difference
+
+class LocationLists:
+    def __init__(self, values_1=(), values_2=()):
+        self.left = defaultdict(int)
+        self.right = defaultdict(int)
+        for v in values_1:
+            self.left[v] += 1
+        for v in values_2:
+            self.right[v] += 1
+        self.left_length = len(values_1)
+        self.right_length = len(values_2)
+        self.similarity = sum(v * count * self.right.get(v, 0) for (v, count) in self.left.items())
+
+        # starting from whole lists, the blocks can be built in one go
+        values = sorted(self.left.keys() | self.right.keys())
+        self.cut(values, [self.left.get(v, 0) - self.right.get(v, 0) for v in values])
+
+    # (re)builds every block from the distinct values in order and their differences in counts
+    def cut(self, values, deltas):
+        self.distinct = len(values)
+        self.block_size = max(BLOCK_SIZE, isqrt(self.distinct))
+        self.blocks = []
+        offset = 0
+        for start in range(0, len(values), self.block_size):
+            block = Block(values[start:start + self.block_size], deltas[start:start + self.block_size], offset)
+            self.blocks.append(block)
+            offset += sum(block.deltas)
+        self.total = 0
+        for (i, block) in enumerate(self.blocks):
+            self.rebuild(i)
+            self.total += block.distance()
+        self.firsts = [block.values[0] for block in self.blocks]
+
+    def rebalance(self):
+        target = max(BLOCK_SIZE, isqrt(self.distinct))
+        if target > 2 * self.block_size or 2 * target < self.block_size or len(self.blocks) > 4 * (self.distinct // self.block_size + 1):
+            self.cut([v for block in self.blocks for v in block.values], [delta for block in self.blocks for delta in block.deltas])
+
+    # only meaningful while the lists are the same length - otherwise some values have nothing to pair off with
+    @property
+    def distance(self):
+        if self.left_length != self.right_length:
+            raise Exception(f"Lists are different lengths ({self.left_length} and {self.right_length}), so can't be paired off")
+        return self.total
+
+    def add_left(self, value):
+        self.left[value] += 1
+        self.left_length += 1
+        self.similarity += value * self.right.get(value, 0)
+        self.move(value, 1)
+
+    def add_right(self, value):
+        self.right[value] += 1
+        self.right_length += 1
+        self.similarity += value * self.left.get(value, 0)
+        self.move(value, -1)
+
+    def remove_left(self, value):
+        if self.left.get(value, 0) == 0:
+            raise Exception(f"{value} isn't in the left list")
+        self.left[value] -= 1
+        self.left_length -= 1
+        self.similarity -= value * self.right.get(value, 0)
+        self.move(value, -1)
+
+    def remove_right(self, value):
+        if self.right.get(value, 0) == 0:
+            raise Exception(f"{value} isn't in the right list")
+        self.right[value] -= 1
+        self.right_length -= 1
+        self.similarity -= value * self.left.get(value, 0)
+        self.move(value, 1)
+
+    def rebuild(self, i):
+        self.blocks[i].rebuild(self.blocks[i + 1].values[0] if i + 1 < len(self.blocks) else None)
+
+    # moves D by change from value upwards, once the counts have been updated
+    def move(self, value, change):
+        if len(self.blocks) == 0:
+            self.blocks.append(Block([], [], 0))
+            self.blocks[0].rebuild(None)
+            self.firsts = [value]
+
+        b = max(bisect_right(self.firsts, value) - 1, 0)
+        block = self.blocks[b]
+        i = bisect_left(block.values, value)
+        added = i == len(block.values) or block.values[i] != value
+        removed = self.left.get(value, 0) == 0 and self.right.get(value, 0) == 0
+        # the block before only needs redoing if this block's first value comes or goes, since that's where the one before ends
+        start = b - 1 if b > 0 and i == 0 and (added or removed) else b
+        for j in range(start, b + 1):
+            self.total -= self.blocks[j].distance()
+
+        if added:
+            block.values.insert(i, value)
+            block.deltas.insert(i, 0)
+            self.distinct += 1
+        block.deltas[i] += change
+        if removed:
+            del block.values[i]
+            del block.deltas[i]
+            self.distinct -= 1
+
+        for later in self.blocks[b + 1:]:
+            self.total += later.shift(change)
+
+        replacements = [block]
+        if len(block.values) > 2 * self.block_size:
+            half = len(block.values) // 2
+            second = Block(block.values[half:], block.deltas[half:], block.offset + sum(block.deltas[:half]))
+            (block.values, block.deltas) = (block.values[:half], block.deltas[:half])
+            replacements.append(second)
+        elif len(block.values) == 0 and len(self.blocks) > 1:
+            replacements = []
+        if replacements != [block]:
+            self.blocks[b:b + 1] = replacements
+            self.firsts[b:b + 1] = [replacement.values[0] for replacement in replacements]
+        elif i == 0 and block.values:
+            self.firsts[b] = block.values[0]
+
+        for j in range(start, min(b + len(replacements), len(self.blocks))):
+            self.rebuild(j)
+            self.total += self.blocks[j].distance()
+        self.rebalance()
+
+if __name__ == '__main__':
+    main()
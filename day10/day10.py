@@ -5,72 +5,46 @@
 # i.e. the 9s are already considered nodes, then you can proceed outwards by either DFS or BFS, ignoring any nodes from which that 9 was already reachable
 # since there's a reasonable chance of this, let's define the problem such that we can change what makes nodes adjacent
 
-from collections import deque
+from aoc.grid import Grid
+from aoc.search import bfs
+from aoc.trace import channel
 
-class Node:
-    # because we flow from 9s outwards, each node's neighbour is downward only
-    # we do both directions here so we only need to consider up and left when building the puzzle
-    def add_relation(self, other_node):
-        if self.height == (other_node.height - 1):
-            other_node.leads_to.add(self)
-         
-        if other_node.height == (self.height - 1):
-            self.leads_to.add(other_node)
-    
-    def score(self):
-        return len(self.visible_9s)
-    
-    def __init__(self, height, position):
-        self.visible_9s = set()
-        self.leads_to = set()
-        self.height = height
-        self.rating = 0
-        
-        # we don't actually use this but it's very helpful for debugging
-        self.position = position
-    
-    def __str__(self):
-        return f"{self.height} {self.position} (rating: {self.rating})"
+solve_trace = channel('day10.solve')
 
+ZERO, NINE = ord('0'), ord('9')
+
+# the puzzle lives on a dense grid, with each position's rating and visible 9s kept in arrays/dicts keyed by its flat index
+# rather than a Node object per position linked up to its neighbours
 class Puzzle:
     def __str__(self):
-        return f"Puzzle: peaks {[str(p) for p in self.peaks]}, trailheads {[str(th) for th in self.trailheads]}"
+        return f"Puzzle: peaks {[self.grid.coords(p) for p in self.peaks]}, trailheads {[self.grid.coords(th) for th in self.trailheads]}"
     
-    def __init__(self, lines):
-        self.peaks = set()
-        self.trailheads = set()
-        
-        prev_row = None
-        for (i, line) in enumerate(lines):
-            node_row = []
-            prev_node = None
-            for (j, v) in enumerate(line):
-                # catch invalid ints so we can use the impassable examples
-                try:
-                    node = Node(int(v), (j, i))
-                    if node.height == 0:
-                        self.trailheads.add(node)
-                    elif node.height == 9:
-                        self.peaks.add(node)
-                except ValueError:
-                    node_row.append(None)
-                    prev_node = None
-                    continue
-                
-                # do left-right relations (doesn't loop round the map so only needs to be )
-                if prev_node is not None:
-                    node.add_relation(prev_node)
-                
-                # do up-down relations
-                if prev_row is not None:
-                    up_node = prev_row[j]
-                    if up_node is not None:
-                        node.add_relation(up_node)
-                
-                node_row.append(node)
-                prev_node = node
-            prev_row = node_row
+    def __init__(self, grid):
+        self.grid = grid
+        # anything that isn't a digit (e.g. the '.'s in the impassable examples) is never a peak, trailhead or next step down
+        self.peaks = grid.find_all(NINE)
+        self.trailheads = grid.find_all(ZERO)
+        self.ratings = [0] * len(grid.cells)
+        self.visible_9s = {}
+        self.solved = False
+    
+    def score(self, index):
+        return len(self.visible_9s.get(index, ()))
     
+    # because we flow from 9s outwards, each position's neighbours are downward only
+    def leads_to(self, index):
+        cells = self.grid.cells
+        height = cells[index]
+        if height <= ZERO:
+            return []
+        return [index + d for d in self.grid.directions if cells[index + d] == height - 1]
+    
+    # both parts read the results of solve, but it accumulates ratings so must only ever run once
+    def ensure_solved(self):
+        if not self.solved:
+            self.solve()
+            self.solved = True
+
     def solve(self):
         # part 1: sum the score of every trailhead, so iterate from each peak until we've propagated it to every node that it could reach
         # I originally implemented this as a separate DFS (thinking the adjacency relation might change), but after seeing part2 I realised you can roll it with the rating
@@ -78,48 +52,44 @@ class Puzzle:
         # you could do this in a single pass by propagating the visible peaks at each step too, but it's easier to reason about doing it in two passes
         
         # start at all the peaks, which each only have one way to reach them and can only see themselves 
-        queue = deque()
         for peak in self.peaks:
-            peak.rating = 1
-            peak.visible_9s.add(peak)
-            queue.append(peak)
+            self.ratings[peak] = 1
+            self.visible_9s[peak] = {peak}
         
-        # for every other node, their base rating is 0 (set in constructor), so we can simply add the currently-being-considered node's rating to it
-        # starting from all the peaks means we can sum them in one fell swoop and know we've visited every outbound path from there already, i.e. we know it propagates safely
+        # for every other node, their base rating is 0, so we can simply add the currently-being-considered node's rating to it
+        # a BFS out from all the peaks at once visits every node at one height before any at the next height down,
+        # so by the time we reach a node in the search order we've already summed every outbound path from there, i.e. we know it propagates safely
         # (wouldn't work if the adjacency relation weren't one-way)
-        # we only maintain the ever queued set so that we don't end up blowing up for each possible route
-        ever_queued_nodes = set()
-        while len(queue) > 0:
-            node = queue.popleft()
-            print(f"Visiting {node} (rating leads to {[str(n) for n in node.leads_to]})")
+        # the search only visits each node once, so that we don't end up blowing up for each possible route
+        search = bfs(len(self.grid.cells), self.peaks, self.leads_to)
+        for node in search.order:
+            candidates = self.leads_to(node)
+            if solve_trace.enabled:
+                solve_trace(f"Visiting {self.grid.coords(node)} (rating {self.ratings[node]} leads to {[self.grid.coords(n) for n in candidates]})")
+                solve_trace.count("nodes visited")
             
-            for candidate in node.leads_to:
-                candidate.rating += node.rating
-                candidate.visible_9s = candidate.visible_9s.union(node.visible_9s)
-                if candidate not in ever_queued_nodes:
-                    ever_queued_nodes.add(candidate)
-                    queue.append(candidate)
-def accept_input():
-    lines = []
-    while True:
-        try:
-            lines.append(input())
-        except EOFError:
-            return Puzzle(lines)
+            for candidate in candidates:
+                self.ratings[candidate] += self.ratings[node]
+                # update in place, since every candidate's set was made fresh for it
+                self.visible_9s.setdefault(candidate, set()).update(self.visible_9s[node])
+def accept_input(source=None):
+    return Puzzle(Grid.read(source))
 
 def part1(puzzle):
+    puzzle.ensure_solved()
     total = 0
     for trailhead in puzzle.trailheads:
-        th_score = trailhead.score()
+        th_score = puzzle.score(trailhead)
         #print(f"Trailhead {trailhead} has score {th_score}")
         total += th_score
     
     return total
 
 def part2(puzzle):
+    puzzle.ensure_solved()
     total = 0
     for trailhead in puzzle.trailheads:
-        th_rating = trailhead.rating
+        th_rating = puzzle.ratings[trailhead]
         #print(f"Trailhead {trailhead} has rating {th_rating}")
         total += th_rating
     
@@ -127,8 +97,8 @@ def part2(puzzle):
 
 def main():
     puzzle = accept_input()
-    puzzle.solve()
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
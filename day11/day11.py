@@ -3,25 +3,29 @@
 
 from math import log10, floor
 
-def accept_input():
-    line = input()
-    return [int(v) for v in line.split(" ")]
+from aoc.inputs import read_text
+from aoc.memo import MISSING, bounded_memo
+
+def accept_input(source=None):
+    return [int(v) for v in read_text(source).split()]
 
 # for part1, it was safe to simulate all the stones directly
 # however for part2 we can't do that... but we're certainly running into shared subproblems (not least for any duplicated stones)
 # hence we can memoize by (stone value, blinks_remaining) and sum that rather than just stepping
 # this is easier to reason about if we start using values directly rather than logarithms - I should've just used values to start off with
 # (although using the list representation to start off with was nicer in case we changed how the step function worked) 
-memo = {}
+# the memo doesn't depend on the input, so in a long-running process it carries over from one input to the next (hence the cap on its size)
+memo = bounded_memo('day11.stones_for_count')
 def stones_for_count(stone, blinks):
-    if (stone, blinks) in memo:
-        return memo[(stone, blinks)]
-    else:
-        # base case, no blinks left => it's just this number
-        # no need to memoise that
-        if blinks == 0:
-            return 1
+    # base case, no blinks left => it's just this number
+    # no need to memoise that (and no point looking it up, since a lookup that misses makes room for storing the answer)
+    if blinks == 0:
+        return 1
 
+    val = memo[(stone, blinks)]
+    if val is not MISSING:
+        return val
+    else:
         # otherwise, you've got blinks left, so step the stone
         if stone == 0:
             val = stones_for_count(1, blinks - 1)
@@ -54,4 +58,5 @@ def main():
 
     print(f"Memo size: {len(memo)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -2,58 +2,44 @@
 # > Plants of the same type can appear in multiple separate regions, and regions can even appear within other regions.
 # i.e. we need to identify regions through some other means than just their letter
 
-# we can do this by building a graph of plots, literally connecting them when they are adjacent
-# each plot node can then be part of a broader matrix so we can connect them up and left as needed
-# then we can sum region sizes and perimeters by going across the matrix, visiting each node and its neighbours to find the region, and multiplying them to get the price
+# the plots live on a dense grid, and two plots are connected when they're adjacent and hold the same plant type
+# then we can sum region sizes and perimeters by going across the grid, flood-filling each unvisited plot to find its region, and multiplying them to get the price
 
-class Plot:
-    def exposed_sides(self):
-        return 4 - len(self.neighbours)
-    
-    def __init__(self, plant_type):
-        self.plant_type = plant_type
+from aoc.grid import Grid
+from aoc.trace import channel
 
-        self.neighbours = {}
-    
-    def __str__(self):
-        return self.plant_type
-    
-    def add_neighbour(self, direction, other_node):
-        if self.plant_type == other_node.plant_type:
-            self.neighbours[direction] = other_node
-    
-    def _find_region(self, region):
-        # to get a node's region, simply accumulate the set of itself, its neighbours, and all its neighbours' neighbours
-        if self not in region:
-            region.add(self)
-            for neighbour in self.neighbours.values():
-                neighbour._find_region(region)
-        
-        return region
+get_regions_trace = channel('day12.get_regions')
 
-    
-    def get_region(self):
-        return Region(self._find_region(set()))
+# directions are indices into grid.directions, which go clockwise from up
+UP, RIGHT, DOWN, LEFT = range(4)
 
 class Region:
-    def __init__(self, node_set):
+    def __init__(self, grid, node_set):
+        self.grid = grid
         self.node_set = node_set
+        self.plant_type = grid[next(iter(node_set))]
+    
+    def has_neighbour(self, node, direction):
+        return self.grid[node + self.grid.directions[direction]] == self.plant_type
+    
+    def exposed_sides(self, node):
+        return sum(1 for d in range(4) if not self.has_neighbour(node, d))
     
     def perimeter(self):
-        return sum(plot.exposed_sides() for plot in self.node_set)
+        return sum(self.exposed_sides(plot) for plot in self.node_set)
     
     def area(self):
         return len(self.node_set)
     
     def count_sides_from(self, start_node, direction, visited):
         # assert that the provided direction is a normal
-        if direction in start_node.neighbours:
+        if self.has_neighbour(start_node, direction):
             return 0
         
         # don't walk around a side we already walked
         # we could trade time for memory by only storing the start node/directions and only giving up when we hit them
         # memory goes from O(number of nodes) to O(number of sides), and time goes up to O(number of nodes^2) given the worst case of a line of nodes of the same type
-        if (start_node, direction) in visited:
+        if start_node * 4 + direction in visited:
             return 0
 
         # now we can walk around the edge of this side
@@ -62,37 +48,37 @@ class Region:
         # call the direction we got here in the "normal direction" (originally derived since we just iterated that way til we hit a side)
         normal = direction
 
-        clockwise_direction = {'u' : 'r', 'r' : 'd', 'd' : 'l', 'l' : 'u'}
         # pick a perpendicular direction to move in (whether we're doing a clockwise or counterclockwise traversal. I'm going oldschool)
-        travel = clockwise_direction[normal]
+        # directions go clockwise, so the next one round is clockwise and two round is the opposite
+        travel = (normal + 1) % 4
 
-        opposite_direction = {'u' : 'd', 'd' : 'u', 'l' : 'r', 'r' : 'l'}
+        offsets = self.grid.directions
 
         # until we end up at the original node...
         node = start_node
         back_at_start = False
         sides = 0
         while not back_at_start:
-            visited.add((node, normal))
+            visited.add(node * 4 + normal)
             # one of these cases is true:
-            if travel in node.neighbours:
-                travel_node = node.neighbours[travel]
+            if self.has_neighbour(node, travel):
+                travel_node = node + offsets[travel]
                 
                 # - there is a node in that direction, and a node in the normal direction.
-                if normal in travel_node.neighbours:
+                if self.has_neighbour(travel_node, normal):
                     # this is a concave corner. add to the count, set the normal direction to the opposite of the direction of travel, set the direction of travel to the old normal direction, and move to that new node
                     # note that it has to be empty space since the new travel node's normal points into the same empty square as the original node's normal
-                    node = travel_node.neighbours[normal]
+                    node = travel_node + offsets[normal]
 
                     sides += 1
-                    (normal, travel) = opposite_direction[travel], normal
+                    (normal, travel) = (travel + 2) % 4, normal
                 else:
                     # - there is a node in that direction, and no node in the normal direction. this is the same side, do not add to the count and just move to that node
                     node = travel_node
             else:
                 # - there is no node in that direction. this is a convex corner. add to the count, rotate around but stay on the same node
                 sides += 1
-                (normal, travel) = travel, opposite_direction[normal]
+                (normal, travel) = travel, (normal + 2) % 4
             
             # when we get back to the original node facing the same way, then we're done. we already counted that side when we hit the corner, so no need to add to the count
             back_at_start = (node == start_node) and normal == direction
@@ -106,58 +92,53 @@ class Region:
         visited = set()
         total_sides = 0
         for node in self.node_set:
-            for direction in "udlr":
+            for direction in (UP, DOWN, LEFT, RIGHT):
                 total_sides += self.count_sides_from(node, direction, visited)
 
         return total_sides
 
 
 class Puzzle:
-    def __init__(self, lines):
-        self.matrix = []
-
-        prev_row = None
-        for line in lines:
-            row = []
-            left_plot = None
-            for (j,v) in enumerate(line):
-                plot = Plot(v)
-
-                if left_plot is not None:
-                    plot.add_neighbour('l', left_plot)
-                    left_plot.add_neighbour('r', plot)
-
-                if prev_row is not None:
-                    up_plot = prev_row[j]
-                    plot.add_neighbour('u', up_plot)
-                    up_plot.add_neighbour('d', plot)
-                
-                left_plot = plot
-                row.append(plot)
-
-            self.matrix.append(row)
-            prev_row = row
+    def __init__(self, grid):
+        self.grid = grid
     
     def __str__(self):
-        return "\n".join("".join(str(p) for p in line) for line in self.matrix)
+        return str(self.grid)
+
+    def find_region(self, start, visited):
+        # to get a node's region, accumulate itself, its neighbours, and all its neighbours' neighbours
+        # with an explicit stack rather than recursing, since a region can be the whole grid
+        cells = self.grid.cells
+        plant_type = cells[start]
+        region = [start]
+        visited[start] = 1
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for d in self.grid.directions:
+                neighbour = node + d
+                if not visited[neighbour] and cells[neighbour] == plant_type:
+                    visited[neighbour] = 1
+                    region.append(neighbour)
+                    stack.append(neighbour)
+        
+        return Region(self.grid, region)
 
     def get_regions(self):
-        # to find the regions, iterate over the matrix and extract them
-        visited_nodes = set()
-
-        regions = set()        
-        for row in self.matrix:
-            for plot in row:
-                if plot in visited_nodes:
-                    continue
-
-                # we've found an unvisited node, so now we want to visit its whole region
-                region = plot.get_region()
-                print(f"Region found: {[str(p) for p in region.node_set]}")
-                regions.add(region)
-
-                # mark the whole region as visited so we don't consider it again
-                visited_nodes = visited_nodes.union(region.node_set)
+        # to find the regions, iterate over the grid and extract them
+        visited_nodes = bytearray(len(self.grid.cells))
+
+        regions = []
+        for plot in self.grid.indices():
+            if visited_nodes[plot]:
+                continue
+
+            # we've found an unvisited node, so now we want to visit its whole region (which marks it all as visited)
+            region = self.find_region(plot, visited_nodes)
+            if get_regions_trace.enabled:
+                get_regions_trace(f"Region found: {[self.grid.coords(p) for p in region.node_set]}")
+                get_regions_trace.count("regions")
+            regions.append(region)
         
         return regions
 
@@ -169,13 +150,8 @@ class Puzzle:
         return sum(region.area() * region.side_count() for region in self.get_regions())
 
 
-def accept_input():
-    lines = []
-    while True:
-        try:
-            lines.append(input())
-        except EOFError:
-            return Puzzle(lines)
+def accept_input(source=None):
+    return Puzzle(Grid.read(source))
 
 def part1(puzzle):
     return puzzle.total_price()
@@ -189,4 +165,5 @@ def main():
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
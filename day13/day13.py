@@ -12,6 +12,11 @@
 import re
 import math
 
+from aoc.inputs import read_lines
+from aoc.trace import channel
+
+minimum_tokens_trace = channel('day13.minimum_tokens')
+
 class Machine:
     def __init__(self, a, b, target):
         self.a = a
@@ -34,8 +39,8 @@ class Machine:
         # now just turn this into a score
         b_numerator = (target[0] - a_presses * a[0])
 
-        if b_numerator % b[0] != 0:
-            print(f"Thought {a_presses} is a solution but {b_numerator / b[0]} is non-integer")
+        if b_numerator % b[0] != 0 and minimum_tokens_trace.enabled:
+            minimum_tokens_trace(f"Thought {a_presses} is a solution but {b_numerator / b[0]} is non-integer")
 
         b_presses = (target[0] - a_presses * a[0]) // b[0]
         
@@ -54,27 +59,24 @@ class Puzzle:
 button_re = re.compile(r'Button (\w): X\+(\d+), Y\+(\d+)')
 prize_re = re.compile(r'Prize: X=(\d+), Y=(\d+)')
 
-def accept_input():
+def accept_input(source=None):
     machines = []
     current_machine = {}
-    while True:
-        try: 
-            line = input()
-            button_match = button_re.match(line)
-            
-            if button_match:
-                current_machine[button_match.group(1)] = (int(button_match.group(2)), int(button_match.group(3)))
-            
-            prize_match = prize_re.match(line)
-            if prize_match:
-                target = (int(prize_match.group(1)), int(prize_match.group(2)))
-                if 'A' in current_machine and 'B' in current_machine:
-                    machines.append(Machine(current_machine['A'], current_machine['B'], target))
-                    current_machine = {}
-                else:
-                    raise Exception(f"got prize {target} without buttons")
-        except EOFError:
-            return Puzzle(machines)
+    for line in read_lines(source):
+        button_match = button_re.match(line)
+        
+        if button_match:
+            current_machine[button_match.group(1)] = (int(button_match.group(2)), int(button_match.group(3)))
+        
+        prize_match = prize_re.match(line)
+        if prize_match:
+            target = (int(prize_match.group(1)), int(prize_match.group(2)))
+            if 'A' in current_machine and 'B' in current_machine:
+                machines.append(Machine(current_machine['A'], current_machine['B'], target))
+                current_machine = {}
+            else:
+                raise Exception(f"got prize {target} without buttons")
+    return Puzzle(machines)
 
 def part1(puzzle):
     return puzzle.minimum_tokens()
@@ -95,4 +97,5 @@ def main():
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 import re
 import math
 
+from aoc.inputs import read_lines
+from aoc.trace import channel
+
+christmas_tree_trace = channel('day14.deduce_christmas_tree_time')
+
 # Python's built-in mod can return negative values (e.g. -1 mod 2 is -1), which we don't want. so define our own instead
 def mod(a, b):
     return (a+b) % b
@@ -65,7 +70,7 @@ class Puzzle:
     def print_positions_at_time(self, seconds):
         robot_positions = sorted(r.position_after(seconds, self.size) for r in self.robots)
 
-        print(f"Positions at second {seconds}")
+        christmas_tree_trace(f"Positions at second {seconds}")
         
         robot_positions.reverse() 
         next_robot = robot_positions.pop()
@@ -84,7 +89,7 @@ class Puzzle:
                     line += '.'
                 else:
                     line += str(count)
-            print(line)
+            christmas_tree_trace(line)
     
     def deduce_christmas_tree_time(self):
         for seconds in range(100000):
@@ -102,8 +107,9 @@ class Puzzle:
                     consecutive = 0
                 
                 if consecutive > 10:
-                    print("Found 10 consecutive, printing image")
-                    self.print_positions_at_time(seconds)
+                    if christmas_tree_trace.enabled:
+                        christmas_tree_trace("Found 10 consecutive, printing image")
+                        self.print_positions_at_time(seconds)
                     return seconds
                 
                 prev_pos = pos
@@ -113,14 +119,9 @@ class Puzzle:
 
 robot_re = re.compile('p=(\d+),(\d+) v=(-?\d+),(-?\d+)')
 
-def accept_input():
+def accept_input(source=None):
     robots = []
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            return Puzzle(robots, (101, 103))
-
+    for line in read_lines(source):
         match = robot_re.match(line)
 
         if not match:
@@ -130,6 +131,8 @@ def accept_input():
         velocity = (int(match.group(3)), int(match.group(4)))
         robots.append((position, velocity))
 
+    return Puzzle(robots, (101, 103))
+
 def part1(puzzle):
     return puzzle.safety_factor_after_time(100)
 
@@ -142,4 +145,5 @@ def main():
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,129 +1,95 @@
-from enum import Enum
-import copy
+from enum import IntEnum
 
-class Tile(Enum):
-    FREE = 0
-    WALL = 1
-    BOX = 2
-    BOX_LEFT = 3
-    BOX_RIGHT = 4
+from aoc.grid import Grid
+from aoc.inputs import read_sections
+
+# each tile is the character it's drawn as, so the map can sit in a Grid as-is
+class Tile(IntEnum):
+    FREE = ord('.')
+    WALL = ord('#')
+    BOX = ord('O')
+    BOX_LEFT = ord('[')
+    BOX_RIGHT = ord(']')
 
     def __str__(self):
-        match self:
-            case Tile.FREE:
-                return '.'
-            case Tile.WALL:
-                return '#'
-            case Tile.BOX:
-                return 'O'
-            case Tile.BOX_LEFT:
-                return '['
-            case Tile.BOX_RIGHT:
-                return ']'
+        return chr(self)
 
 class Map:
     @staticmethod
     def from_lines(map_lines):
+        grid = Grid.from_lines(map_lines)
 
-        map = []
-        robot_position = None
-
-        for (y,text_line) in enumerate(map_lines):
-            tile_line = []
-            for (x,c) in enumerate(text_line):
-                match c:
-                    case '.':
-                        tile_line.append(Tile.FREE)
-                    case 'O':
-                        tile_line.append(Tile.BOX)
-                    case '#':
-                        tile_line.append(Tile.WALL)
-                    case '@':
-                        # as our protagonist, we'll treat the robot differently
-                        # mark the space free, and keep track of its position instead
-                        tile_line.append(Tile.FREE)
-                        robot_position = (x,y)
-                    case _:
-                        raise Exception(f"Invalid character {c} at position {x,y}")
-            map.append(tile_line)
-
-        if robot_position is None:
+        # as our protagonist, we'll treat the robot differently
+        # mark the space free, and keep track of its position instead
+        robot_position = grid.find(ord('@'))
+        if robot_position == -1:
             raise Exception("Map does not contain robot")
+        grid[robot_position] = Tile.FREE
+
+        # everything left over should be a tile (or the border round the outside)
+        invalid = grid.cells.translate(None, b'.O#' + bytes([grid.border]))
+        if len(invalid) > 0:
+            position = grid.coords(grid.find(invalid[0]))
+            raise Exception(f"Invalid character {chr(invalid[0])} at position {position}")
         
-        return Map(map, robot_position)
+        return Map(grid, robot_position)
     
-    def __init__(self, map_tiles, robot_position):
-        self.map = map_tiles
+    def __init__(self, grid, robot_position):
+        # positions are flat indices into the grid
+        self.grid = grid
         self.robot_position = robot_position
     
     def __str__(self):
-        # to print the map, convert each tile to its string, special-casing the robot
+        # to print the map, draw a copy of the grid with the robot stamped on it
         # in retrospect this would've been easier to reason about if I'd just had the robot as its own tile from the beginning...
-
-        out = []
-        for (y, line) in enumerate(self.map):
-            out_line = []
-            for (x, t) in enumerate(line):
-                if (x,y) == self.robot_position:
-                    out_line.append('@')
-                else:
-                    out_line.append(str(t))
-            out.append("".join(out_line))
-        return "\n".join(out)
+        out = self.grid.copy()
+        out[self.robot_position] = ord('@')
+        return str(out)
     
     # "(This process does not stop at wall tiles; measure all the way to the edges of the map.)"
     # easier just to keep the outer walls in our representation.
     def total_gps_score(self):
         total = 0
-        for (y, line) in enumerate(self.map):
-            for (x,tile) in enumerate(line):
-                # closest edge to the top left corner in part 2 is always the left part of the box
-                if tile == Tile.BOX or tile == Tile.BOX_LEFT:
-                    total += x + 100*y
+        # closest edge to the top left corner in part 2 is always the left part of the box
+        for index in self.grid.find_all(Tile.BOX) + self.grid.find_all(Tile.BOX_LEFT):
+            (x, y) = self.grid.coords(index)
+            total += x + 100*y
         
         return total
     
     def copy(self):
-        return Map(copy.deepcopy(self.map), self.robot_position)
+        return Map(self.grid.copy(), self.robot_position)
     
     def widen(self):
-        new_map = []
-        for line in self.map:
-            new_line = []
-            for tile in line:
-                match tile:
-                    case Tile.FREE:
-                        new_line += [Tile.FREE, Tile.FREE]
-                    case Tile.BOX:
-                        new_line += [Tile.BOX_LEFT, Tile.BOX_RIGHT]
-                    case Tile.WALL:
-                        new_line += [Tile.WALL, Tile.WALL]
-                    case _:
-                        raise Exception(f"Tried to widen invalid tile {tile}") 
-            
-            new_map.append(new_line)
+        grid = self.grid
+        wide = Grid(2 * grid.width, grid.height, fill=None)
+        for y in range(grid.height):
+            row = bytes(grid.row(y))
+            if len(row.translate(None, b'.O#')) > 0:
+                raise Exception(f"Tried to widen invalid tile in row {y}: {row}")
+            wide.row(y)[:] = row.replace(b'.', b'..').replace(b'#', b'##').replace(b'O', b'[]')
         
-        new_robot_position = (2 * self.robot_position[0], self.robot_position[1])
-        return Map(new_map, new_robot_position)
+        (x, y) = grid.coords(self.robot_position)
+        return Map(wide, wide.index(2 * x, y))
     
     def get_tile(self, position):
-        return self.map[position[1]][position[0]]
+        return self.grid[position]
     
     def set_tile(self, position, tile):
-        self.map[position[1]][position[0]] = tile
+        self.grid[position] = tile
     
     # worth noting that we can try moving boxes in whichever way, and it might eventually fail
     # a not-super-nice workaround here is to be eager and back out, undoing changes to the map if it fails at the top level
     def move_boxes_starting_from(self, position, delta, cloned_map = None):
         next_pos = position
         while True:
-            next_pos = (next_pos[0] + delta[0], next_pos[1] + delta[1])
+            next_pos = next_pos + delta
             next_tile = self.get_tile(next_pos)
             match next_tile:
                 # if we hit a wall, nothing can happen, so just return (the move was a no-op)
                 case Tile.WALL:
                     # we return the existing map in this scenario since we don't want to revert in the instance we just hit the wall without attempting to move anything
-                    return (False, self.map)
+                    return (False, self.grid.cells)
                 # if we hit a whole box, then we add it to the stack
                 case Tile.BOX:
                     continue
@@ -135,20 +101,20 @@ class Map:
                     # handle a partial box
                     if next_tile != Tile.FREE:
                         # if we're moving horizontally, it's no different to the one box case. just stack that up and move them at once
-                        if delta[1] == 0:
+                        if abs(delta) == 1:
                             continue
 
                         # if we're moving vertically, then we might be in contact with 0, 1 or 2 other boxes
                         if next_tile == Tile.BOX_LEFT:
-                            other_box_pos = (next_pos[0] + 1, next_pos[1])
+                            other_box_pos = next_pos + 1
                         elif next_tile == Tile.BOX_RIGHT:
-                            other_box_pos = (next_pos[0] - 1, next_pos[1])
+                            other_box_pos = next_pos - 1
                         
                         # try moving both of the tiles above us 
                         # we might be about to make a mistake, so take a copy of the map now, and pass that into the children
                         # this is so we don't unnecessarily clone the map every single time, only when we're doing something we might need to undo 
                         if cloned_map == None:
-                            cloned_map = copy.deepcopy(self.map)
+                            cloned_map = self.grid.cells.copy()
                         
                         (first_box_moved, _) = self.move_boxes_starting_from(next_pos, delta, cloned_map=cloned_map)
                         
@@ -164,7 +130,7 @@ class Map:
                         # (my initial implementation actually wouldn't have worked in a mixed box type scenario I don't think, as we wouldn't have moved the other boxes we skipped over)
 
                     # move them one by one starting from the previous position all the way back to the robot 
-                    prev_pos = (next_pos[0] - delta[0], next_pos[1] - delta[1])
+                    prev_pos = next_pos - delta
                     prev_tile = self.get_tile(prev_pos)
 
                     prev_prev_pos = next_pos
@@ -177,20 +143,21 @@ class Map:
                             break
 
                         prev_prev_pos = prev_pos
-                        prev_pos = (prev_pos[0] - delta[0], prev_pos[1] - delta[1])
+                        prev_pos = prev_pos - delta
                         prev_tile = self.get_tile(prev_pos)
                     
                     return (True, None)
                 case _:
-                    raise Exception(f"Unhandled tile {next_tile} at {next_pos}")
+                    raise Exception(f"Unhandled tile {next_tile} at {self.grid.coords(next_pos)}")
 
 
     
     # "The problem is that the movements will sometimes fail as boxes are shifted around"
     # i.e. we'll need to check if the robot actually pushes boxes and move them all as one if possible
     def execute_move(self, move):
-        # map from positions in the input to (x, y) changes (given this is a top-left centered coordinate system)
-        direction_dict = {'<': (-1, 0), '^': (0, -1), '>': (1, 0), 'v': (0, 1)}
+        # map from positions in the input to index changes in the grid (given this is a top-left centered coordinate system)
+        grid = self.grid
+        direction_dict = {'<': grid.left, '^': grid.up, '>': grid.right, 'v': grid.down}
 
         delta = direction_dict[move]
 
@@ -200,10 +167,10 @@ class Map:
 
         # we successfully moved the robot!
         if robot_moved:
-            self.robot_position = (self.robot_position[0] + delta[0], self.robot_position[1] + delta[1])
+            self.robot_position += delta
         else:
             # we failed to move the robot, so reset to the state we were told it was in before
-            self.map = next_map
+            self.grid.cells = next_map
 
 class Puzzle:
     def __init__(self, puzzle_map, moves):
@@ -233,28 +200,10 @@ class Puzzle:
        
         return this_map
     
-def accept_map():
-    lines = []
-    while True:
-        line = input()
-        if not line:
-            return Map.from_lines(lines)
-        
-        lines.append(line)
-
-def accept_moves():
-    moves = ""
-    while True:
-        try:
-            line = input()
-            moves += line
-        except EOFError:
-            return moves
-
-def accept_input():
-    puzzle_map = accept_map()
-    puzzle_moves = accept_moves()
-    return Puzzle(puzzle_map, puzzle_moves)
+def accept_input(source=None):
+    map_lines, move_lines = read_sections(source)[:2]
+    # the moves are split over several lines, but that's just for display - join them once rather than appending line by line
+    return Puzzle(Map.from_lines(map_lines), "".join(move_lines))
 
 def part1(puzzle):
     executed_map = puzzle.run_moves()
@@ -270,4 +219,5 @@ def main():
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,55 +1,37 @@
-from enum import Enum
-from collections import deque
+from enum import IntEnum
 
-from heapq import heappush, heappop, heapify
+from aoc.grid import Grid
+from aoc.search import bfs, dijkstra
 
-class Tile(Enum):
-    FREE = 0
-    WALL = 1
-    START = 2
-    END = 3
+# each tile is the character it's drawn as, so the map can sit in a Grid as-is
+class Tile(IntEnum):
+    FREE = ord('.')
+    WALL = ord('#')
+    START = ord('S')
+    END = ord('E')
 
     def __str__(self):
-        match self:
-            case Tile.FREE:
-                return '.'
-            case Tile.WALL:
-                return '#'
-            case Tile.START:
-                return 'S'
-            case Tile.END:
-                return 'E'
+        return chr(self)
 
 
 class Map:
-    def __init__(self, lines) -> None:
-        self.map = []
-        self.start_pos = None
-        self.end_pos = None
-        for (y, line) in enumerate(lines):
-            tile_line = []
-            for (x, c) in enumerate(line):
-                match c:
-                    case '#':
-                        tile_line.append(Tile.WALL)
-                    case '.':
-                        tile_line.append(Tile.FREE)
-                    case 'S':
-                        tile_line.append(Tile.START)
-                        self.start_pos = (x,y)
-                    case 'E':
-                        tile_line.append(Tile.END)
-                        self.end_pos = (x,y)
-                    case _:
-                        raise Exception(f"Unknown tile {c} at ({x},{y})")
-            self.map.append(tile_line)
+    def __init__(self, grid) -> None:
+        # positions are flat indices into the grid
+        self.grid = grid
+        self.start_pos = grid.find(Tile.START)
+        self.end_pos = grid.find(Tile.END)
+
+        invalid = grid.cells.translate(None, b'#.SE' + bytes([grid.border]))
+        if len(invalid) > 0:
+            raise Exception(f"Unknown tile {chr(invalid[0])} at {grid.coords(grid.find(invalid[0]))}")
     
     def __str__(self) -> str:
-        return "\n".join("".join(str(t) for t in line) for line in self.map)
+        return str(self.grid)
  
     # gets the tile at a given position
     def get_tile(self, position):
-        return self.map[position[1]][position[0]]
+        return self.grid[position]
+
     
     # "Reindeer compete for the lowest score"
     # i.e. look for the route through the maze with the fewest rotations
@@ -73,105 +55,75 @@ class Map:
     #
     # start from the end, and iterate backwards - drawback, we have uncertainty about directions, benefit is that we always have the cheapest route from that point to the end, and the cheapest way onto the exit is always to walk directly onto it
     # ...actually, wait a second, we can just use our plain old friend Dijkstra for this!
-    def calculate_cheapest_paths(self):
-        # start by searching from the start position with score 0
-        visited = {}
+    #
+    # each search state is a position and which way we're facing, packed into one int as position * 4 + direction
+    # (directions index into grid.directions, which go clockwise from up, so turning is +/- 1)
+    def state(self, position, direction):
+        return position * 4 + direction
+
+    # we can either move forwards, or turn and move as their own move
+    # no point considering going backwards since we special-case it at the start position
+    def moves(self, state):
+        (position, direction) = (state >> 2, state & 3)
+        cells = self.grid.cells
+        moves = []
+        for (score_delta, this_direction) in ((1, direction), (1001, (direction + 1) & 3), (1001, (direction - 1) & 3)):
+            next_position = position + self.grid.directions[this_direction]
+            # if it's a wall, we can't go there
+            if cells[next_position] != Tile.WALL:
+                moves.append((next_position * 4 + this_direction, score_delta))
+        return moves
+
+    # the same moves run backwards: which states could have got us here, and for how much
+    def reverse_moves(self, state):
+        (position, direction) = (state >> 2, state & 3)
+        previous_position = position - self.grid.directions[direction]
+        if self.grid.cells[previous_position] == Tile.WALL:
+            return ()
+        previous_state = previous_position * 4
+        return ((previous_state + direction, 1), (previous_state + ((direction + 1) & 3), 1001), (previous_state + ((direction - 1) & 3), 1001))
+
+    def end_states(self):
+        return [self.state(self.end_pos, d) for d in range(4)]
 
-        # we add all 4 positions here because the only time that considering a 180 degree turn makes sense is at the start position
+    def calculate_cheapest_paths(self):
+        # we start facing east, but add all 4 directions here because the only time that considering a 180 degree turn makes sense is at the start position
         # otherwise it always leads us back where we came which is pointless
-        heap = [(1000, self.start_pos, (0,1), None), (1000, self.start_pos, (0,-1), None), (2000, self.start_pos, (-1,0), None)]
-        heapify(heap)
-
-        # each node in the heap is the score to get there, the position we'd reach, the (x,y) delta of which way we're facing, and the node we came from
-        node = (0, self.start_pos, (1,0), None) 
-        while node[1] != self.end_pos:
-            score, position, delta, prev_node = node
-            if (position, delta) in visited:
-                # we got the cheapest route here already, but if the score's the same then we want to track that
-                (prev_score, prev_nodes) = visited[(position, delta)]
-                if score == prev_score:
-                    prev_nodes.add(prev_node)
-                
-                # now just move on
-                node = heappop(heap)
-                continue
-
-            # now we've got to consider our alternatives of who we can visit
-            # no point considering going backwards since we already special-cased it at the start position
-            # so we can consider either moving forwards, or turning and moving as their own move
-            for (score_delta, this_delta) in [(1, delta), (1001, rotate(delta, 1)), (1001, rotate(delta, -1))]:
-                # consider the step in that direction
-                next_position = next_pos(position, this_delta)
-                
-                # if it's a wall, we can't go there
-                if self.get_tile(next_position) == Tile.WALL:
-                    continue
-
-                # if we already went there, there's no point, this route is more expensive
-                if (next_position, this_delta) in visited:
-                    continue
-
-                # it's at least worth considering. push it to the queue!
-                heappush(heap, (score + score_delta, next_position, this_delta, (position, delta)))
-            
-            # we can now just say we visited here
-            # if we need to get the route out, then we'd need to store the node that got us here somehow (I was thinking "we can just follow -delta" but it's not that simple since we might turn and move simultaneously)
-            #print(f"Visited {node}")
-            prev_nodes = set()
-            prev_nodes.add(prev_node)
-            visited[(position, delta)] = (score, prev_nodes)
-        
+        sources = {self.state(self.start_pos, d): cost for (d, cost) in ((1, 0), (0, 1000), (2, 1000), (3, 2000))}
+
+        # every move costs 1 or 1001, so the search can use a bucket queue rather than a heap
+        search = dijkstra(len(self.grid.cells) * 4, sources, self.moves, goals=self.end_states(), max_cost=1001)
+        if search.goal is None:
+            raise Exception("No route from start to end")
+
         # we found the shortest path to the end node!
-        # Edge case: there might actually be multiple nodes that are the cheapest predecessor to the end node
-        # for my input, that's not the case, so don't even consider it - we can just follow the cheapest predecessors all the way back from the one before the end node
-
-        return (node[0], visited, prev_node)
-
-# gets the position after moving delta from the start position
-def next_pos(position, delta):
-    return (position[0] + delta[0], position[1] + delta[1])
-
-def rotate(delta, direction):
-    match direction:
-        case 1 | -1:
-            return (direction * delta[1], direction * delta[0])
-        case 0:
-            return delta
-        case 2:
-            return (-delta[0], -delta[1])
-        case _:
-            raise Exception(f"Invalid direction {direction}")
-
-def accept_input():
-    lines = []
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            return Map(lines)
-        lines.append(line)
+        return (search.dist[search.goal], search)
+
+    # a tile is on one of the best paths if we can walk back from the end to it only using moves where the score
+    # goes up by exactly the cost of the move - i.e. that move was one of the cheapest ways of getting where it went
+    # (so this also covers there being several cheapest predecessors, including several cheapest ways onto the end tile)
+    def tiles_on_best_paths(self):
+        (score, search) = self.calculate_cheapest_paths()
+        dist = search.dist
+
+        # the search stopped at the end, but anything cheaper than that was already settled, and anything
+        # on a best path got its final score from a settled neighbour - so its distances are good enough here
+        def cheapest_predecessors(state):
+            return [previous for (previous, cost) in self.reverse_moves(state) if dist[previous] + cost == dist[state]]
+
+        best_ends = [e for e in self.end_states() if dist[e] == score]
+        on_best_paths = bfs(len(dist), best_ends, cheapest_predecessors)
+
+        return set(state // 4 for state in on_best_paths.order)
+
+def accept_input(source=None):
+    return Map(Grid.read(source))
 
 def part1(map):
     return map.calculate_cheapest_paths()[0]
 
 def part2(map):
-    (score, lookback, prev_node) = map.calculate_cheapest_paths()
-
-    # now follow the path dictionary back to sum the number of tiles...
-    visited = set()
-    to_visit = [prev_node]
-
-    node = prev_node
-    while len(to_visit) > 0:
-        visited.add(node[0])
-        to_visit += list(lookback[node][1])
-        node = to_visit.pop()
-        while node is None:
-            node = to_visit.pop()
-    
-    # we didn't count the start (is a tile but no predecessor) or end (we didn't even consider its predecessors and assumed it only had one), so add 2
-    return len(visited) + 2
-
+    return len(map.tiles_on_best_paths())
 
 def main():
     map = accept_input()
@@ -179,4 +131,5 @@ def main():
     print(f"Part 1: {part1(map)}")
     print(f"Part 2: {part2(map)}")
 
-main() 
\ No newline at end of file
+if __name__ == '__main__':
+    main()
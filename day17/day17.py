@@ -1,6 +1,12 @@
 import re
 from enum import IntEnum
 
+from aoc.inputs import read_lines
+from aoc.trace import channel
+
+bruteforce_trace = channel('day17.part2_bruteforce')
+clever_trace = channel('day17.part2_clever')
+
 class Opcode(IntEnum):
     ADV = 0
     BXL = 1
@@ -146,8 +152,8 @@ def part2_bruteforce(computer):
 
             state = (computer.instruction_pointer, a, computer.b, computer.c, tuple(required_output))
         except EndOfProgramError as err:
-            if a % 1000 == 440:
-                print(f"Discarding a={a}, {err}")
+            if bruteforce_trace.enabled and a % 1000 == 440:
+                bruteforce_trace(f"Discarding a={a}, {err}")
             if len(required_output) == 0:
                 return a
     
@@ -195,7 +201,8 @@ def part2_clever(computer):
     while len(required_values) > 0:
         target_value = required_values.pop()
         target_as = part2_iteration(one_iteration_program, target_value, target_as, divisions_per_cycle)
-        print(target_as)
+        if clever_trace.enabled:
+            clever_trace(target_as)
 
     return target_as[0]
 
@@ -222,19 +229,23 @@ def part2_iteration(program, target_value, target_as, divisions_per_cycle):
     
     return valid_outputs
 
-def accept_input():
-    a = parse_register_value(input(), 'A')
-    b = parse_register_value(input(), 'B')
-    c = parse_register_value(input(), 'C')
-    input()
-    program = parse_program(input())
+def part2(computer):
+    return part2_clever(computer)
+
+def accept_input(source=None):
+    lines = read_lines(source)
+    a = parse_register_value(lines[0], 'A')
+    b = parse_register_value(lines[1], 'B')
+    c = parse_register_value(lines[2], 'C')
+    program = parse_program(lines[4])
     return Computer(a, b, c, program)
 
 def main():
     computer = accept_input()
     print(computer)
     print(f"Part 1: {part1(computer)}")
-    print(f"Part 2: {part2_clever(computer)}")
+    print(f"Part 2: {part2(computer)}")
 
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,28 @@
 # today's seems pretty easy - it's a basic dynamic programming problem that you can solve by memoising
 
+from aoc.inputs import read_lines
+from aoc.memo import MISSING, bounded_memo
+
+# the number of ways only depends on the towels we have, so the memo is keyed by the set of towels as well as the pattern
+# that lets it live at module level and carry over between inputs in a long-running process, rather than dying with each Puzzle
+memo = bounded_memo('day19.ways_solvable')
+
 class Puzzle:
     def __init__(self, towels, patterns):
         self.towels = towels
         self.patterns = patterns
-
-        # initialise the memo with the base case - the empty pattern is solvable exactly one way
-        self.memo = {'': 1}
+        # frozensets cache their hash, so keying on this costs no more than keying on the pattern alone
+        self.towel_set = frozenset(towels)
     
     def ways_solvable(self, pattern):
+        # base case - the empty pattern is solvable exactly one way
+        if pattern == '':
+            return 1
+
         # if it's already had the number determined, return that
-        if pattern in self.memo:
-            return self.memo[pattern]
+        ways_solvable = memo[(self.towel_set, pattern)]
+        if ways_solvable is not MISSING:
+            return ways_solvable
         
         ways_solvable = 0
         for towel in self.towels:
@@ -19,7 +30,7 @@ class Puzzle:
             if towel == pattern[:len(towel)]:
                 ways_solvable += self.ways_solvable(pattern[len(towel):])
 
-        self.memo[pattern] = ways_solvable
+        memo[(self.towel_set, pattern)] = ways_solvable
         return ways_solvable
         
     def solvable_patterns(self):
@@ -37,20 +48,15 @@ class Puzzle:
         
         return total
 
-def accept_input():
-    line = input()
-    towels = line.split(', ')
+def accept_input(source=None):
+    lines = read_lines(source)
+    towels = lines[0].split(', ')
 
-    separator = input()
+    separator = lines[1]
     if separator != '':
         raise Exception(f"Expected blank line after towel patterns, got {separator}")
     
-    patterns = []
-    try:
-        while True:
-            patterns.append(input())
-    except EOFError:
-        return Puzzle(towels, patterns)
+    return Puzzle(towels, lines[2:])
 
 def part1(puzzle):
     return len(puzzle.solvable_patterns())
@@ -63,4 +69,5 @@ def main():
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
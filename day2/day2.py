@@ -1,17 +1,15 @@
 # also doing today in Python as I'm still in a rush
 
+from aoc.inputs import read_int_rows_numpy, read_lines
+from aoc.trace import channel
 
-def accept_input():
-    reports = []
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            return reports
-       
-        if not line:
-            return reports
-        reports.append([int(g) for g in line.split(' ')])
+part1_trace = channel('day2.part1')
+part2_trace = channel('day2.part2')
+# checking every report against the brute force version doubles the work, so only happens when asked for (--trace day2.cross_check)
+cross_check_trace = channel('day2.cross_check')
+
+def accept_input(source=None):
+    return [list(map(int, line.split(' '))) for line in read_lines(source) if line]
 
 def is_change_unsafe(v1, v2, increasing):
         # using >= / <= here eliminates the difference = 0 case for us
@@ -28,27 +26,52 @@ def is_report_safe_p1(report):
         current = v
     return 1
 
-# this was my first approach, but I consistently got counts too low. the ones it failed on were where the first element was problematic, because that comparison would pass, and it'd only fail on the third comparison
-# this implementation is also inefficient (we might check the start of the list three times) but at least linearly inefficient
-def is_report_safe_p2_it(report):
-    current = report[0]
-    increasing = (report[1] > report[0])
-    
-    for (i,v) in enumerate(report[1:]):
-        if is_change_unsafe(current, v, increasing):
-            # the problematic element could be either of the two in this comparison
-            # e.g. consider a list 10 1 2 3 4 5 - deleting the first element makes it safe
-            report_discarded_current = report[:i] + report[i+1:]
-            report_discarded_v = report[:i+1] + report[i+2:]
-            #print(f"Discarding {current}, {v}; trying {report_discarded_current}, {report_discarded_v}")
-            return (is_report_safe_p1(report_discarded_v) or is_report_safe_p1(report_discarded_current) or is_report_safe_p1(report[1:]))
-        current = v
-    return 1
+# my first approach tried discarding one of the two values either side of the first unsafe change (or the first value), but
+# that built up to three new lists per report, and it's easy to get wrong - it undercounted until I added the first value case
+# instead, look at it as picking which values to keep: the fewest removals that leave report[:i + 1] safe with report[i] kept
+# is the best over the last kept value j before it, plus the i - j - 1 values skipped in between. with at most k removals
+# j can't be more than k + 1 back, so this is O(n * k) and never copies the report
+def removals_needed(report, k, increasing):
+    n = len(report)
+    sign = 1 if increasing else -1
+    # everything up to the first unsafe change can be kept as it is
+    start = 1
+    while start < n and 1 <= (report[start] - report[start - 1]) * sign <= 3:
+        start += 1
+    fewest = [0] * n
+    best = min(k + 1, n - start)
+    last_possible = start - 1
+    for i in range(start, n):
+        # keeping report[i] as the first value means dropping everything before it
+        least = i if i <= k else k + 1
+        for j in range(max(0, i - k - 1), i):
+            removals = fewest[j] + i - j - 1
+            if removals < least and 1 <= (report[i] - report[j]) * sign <= 3:
+                least = removals
+        fewest[i] = least
+        if least <= k:
+            last_possible = i
+        elif i - last_possible > k:
+            # nothing in reach of the next value can be kept, so there's no point going any further
+            return k + 1
+        # and keeping it as the last means dropping everything after it
+        best = min(best, least + n - 1 - i)
+    return best
+
+# whether the report can be made safe by removing at most k values (so k = 0 is part 1, and k = 1 the problem dampener)
+def is_report_safe(report, k=0):
+    # a single value (or none) is trivially safe
+    if len(report) <= k + 1:
+        return 1
+    # try whichever direction the report mostly goes in first, since a safe report usually stops there
+    likely = report[-1] > report[0]
+    return int(removals_needed(report, k, likely) <= k or removals_needed(report, k, not likely) <= k)
 
 def is_report_safe_p2(report):
     current = report[0]
     increasing = (report[1] > report[0])
     # this is worst-case quadratic in complexity but the lists are short enough for it to be computationally feasible
+    # (it's kept as the obviously-correct version to check is_report_safe against, see cross_check)
     for i in range(len(report)):
         if is_report_safe_p1(report[:i] + report[i+1:]):
             return 1
@@ -56,25 +79,103 @@ def is_report_safe_p2(report):
        
 def part1(reports):
     safe = [is_report_safe_p1(report) for report in reports]
-    print(safe)
+    if part1_trace.enabled:
+        part1_trace(safe)
     return sum(safe)
     
 def part2(reports):
-    safe = [is_report_safe_p2_it(report) for report in reports]
-    print(safe)
+    safe = [is_report_safe(report, 1) for report in reports]
+    if part2_trace.enabled:
+        part2_trace(safe)
+    if cross_check_trace.enabled:
+        cross_check(reports, safe)
     return sum(safe)
 
+def cross_check(reports, safe):
+    for (report, report_safe) in zip(reports, safe):
+        if is_report_safe_p2(report) != report_safe:
+            cross_check_trace(f"Dampened check disagrees with brute force for {report}")
+
 def main():
     reports = accept_input()
     part1_result = part1(reports)
     print(f'Part 1 safe reports: {part1_result}')
     part2_result = part2(reports)
     print(f'Part 2 problem-dampened safe reports: {part2_result}')
-    
-    for report in reports:
-        actually_safe = is_report_safe_p2(report) 
-        iterative_safe = is_report_safe_p2_it(report)
-        if actually_safe and not iterative_safe:
-            print(f"Iterative method failed for {report}")
-    
-main()
\ No newline at end of file
+
+# vectorised versions (python -m aoc run 2 --mode numpy) for millions of reports
+# the reports are one flat array of values with the offset each report starts at, and safety comes from looking at every
+# change in every report at once - a change is bad if it's out of 1..3 in the direction we're checking
+def accept_input_numpy(source=None):
+    return read_int_rows_numpy(source)
+
+# segment_sums(flags, starts, ends)[r] counts the flags in flags[starts[r]:ends[r]]
+# (done with a running total rather than np.add.reduceat, which gets empty segments wrong)
+def segment_sums(flags, starts, ends):
+    import numpy as np
+
+    cumulative = np.concatenate(([0], np.cumsum(flags)))
+    return cumulative[ends] - cumulative[starts]
+
+# whether each change (values[i + 1] - values[i]) is bad going in direction, ignoring the changes between one report and the next
+def bad_changes(values, offsets, direction):
+    import numpy as np
+
+    steps = np.diff(values) * direction
+    bad = (steps < 1) | (steps > 3)
+    bad[offsets[1:-1] - 1] = False
+    return bad
+
+def bad_counts(values, offsets, direction):
+    # report r's changes are indices offsets[r] .. offsets[r + 1] - 2
+    return segment_sums(bad_changes(values, offsets, direction), offsets[:-1], offsets[1:] - 1)
+
+def part1_numpy(values, offsets):
+    import numpy as np
+
+    if len(values) == 0:
+        return 0
+    safe = (bad_counts(values, offsets, 1) == 0) | (bad_counts(values, offsets, -1) == 0)
+    return int(np.count_nonzero(safe))
+
+# with the dampener, a report is safe if it's safe already or if there's a value that can go, which needs:
+#     - no bad changes other than the (up to two) that value is part of
+#     - the change that bridges the gap it leaves, from the value before to the value after, to be good
+def dampened_safe(values, offsets, direction):
+    import numpy as np
+
+    n = len(values)
+    lengths = np.diff(offsets)
+    report = np.repeat(np.arange(len(lengths)), lengths)
+    first = np.zeros(n, dtype=bool)
+    first[offsets[:-1]] = True
+    last = np.zeros(n, dtype=bool)
+    last[offsets[1:] - 1] = True
+
+    bad = bad_changes(values, offsets, direction)
+    totals = segment_sums(bad, offsets[:-1], offsets[1:] - 1)
+    # the changes into and out of each value, where there is one
+    into = np.concatenate(([False], bad)) & ~first
+    out_of = np.concatenate((bad, [False])) & ~last
+    remaining = totals[report] - into - out_of
+
+    bridged = np.ones(n, dtype=bool)
+    if n > 2:
+        bridges = (values[2:] - values[:-2]) * direction
+        bridged[1:-1] = (bridges >= 1) & (bridges <= 3)
+    # the first and last values of a report don't leave a gap to bridge
+    bridged |= first | last
+
+    removable = (remaining == 0) & bridged
+    return (totals == 0) | (segment_sums(removable, offsets[:-1], offsets[1:]) > 0)
+
+def part2_numpy(values, offsets):
+    import numpy as np
+
+    if len(values) == 0:
+        return 0
+    safe = dampened_safe(values, offsets, 1) | dampened_safe(values, offsets, -1)
+    return int(np.count_nonzero(safe))
+
+if __name__ == '__main__':
+    main()
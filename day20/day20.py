@@ -2,111 +2,66 @@
 # compute the fair distance from every location to the end, then the number of cheats you can sum up by clipping through the walls
 # there's only one route in the input we're given, but I want to implement this to work for more general input
 
-from enum import Enum
+from enum import IntEnum
 from collections import defaultdict
 
-class Tile(Enum):
-    FREE = 0
-    WALL = 1
-    START = 2
-    END = 3
+from aoc.grid import Grid
+from aoc.search import INFINITY, bfs
+
+# each tile is the character it's drawn as, so the map can sit in a Grid as-is
+class Tile(IntEnum):
+    # start is just a special free tile
+    FREE = ord('.')
+    WALL = ord('#')
+    START = ord('S')
+    END = ord('E')
 
     @staticmethod
     def from_char(c):
-        match c:
-            # start is just a special free tile
-            case '.':
-                return Tile.FREE
-            case '#':
-                return Tile.WALL
-            case 'S':
-                return Tile.START
-            case 'E':
-                return Tile.END
-            case _:
-                raise Exception(f"Invalid tile {c}")
-
-class Node:
-    def __init__(self, tile_type, x, y):
-        self.tile_type = tile_type
-        self.neighbours = set()
-        self.cheat_neighbours = set()
-
-        self.x = x
-        self.y = y
- 
-    def add_neighbour(self, other_node):
-        self.cheat_neighbours.add(other_node)
-        if self.tile_type != Tile.WALL and other_node.tile_type != Tile.WALL:
-            self.neighbours.add(other_node)
-    
-    def __str__(self):
-        return f"{self.tile_type} ({self.x}, {self.y})"
+        try:
+            return Tile(ord(c))
+        except ValueError:
+            raise Exception(f"Invalid tile {c}")
 
 class Puzzle:
     @staticmethod
-    def from_lines(lines, cheat_length):
-        grid = []
-        start_node = None
-        end_node = None
-        for (y, line) in enumerate(lines):
-            tile_line = []
-            for (x, c) in enumerate(line):
-                node = Node(Tile.from_char(c), x, y)
-
-                if node.tile_type == Tile.START:
-                    start_node = node
-                elif node.tile_type == Tile.END:
-                    end_node = node
-
-                if len(tile_line) > 0:
-                    left_node = tile_line[-1]
-                    node.add_neighbour(left_node)
-                    left_node.add_neighbour(node)
-                
-                if len(grid) > 0:
-                    up_node = grid[-1][x]
-                    node.add_neighbour(up_node)
-                    up_node.add_neighbour(node)
-
-                tile_line.append(node)
-
-            grid.append(tile_line)
+    def from_grid(grid, cheat_length):
+        invalid = grid.cells.translate(None, b'.#SE' + bytes([grid.border]))
+        if len(invalid) > 0:
+            Tile.from_char(chr(invalid[0]))
+
+        start_node = grid.find(Tile.START)
+        end_node = grid.find(Tile.END)
         
-        if start_node is None:
+        if start_node == -1:
             raise Exception("Grid had no start node")
         
-        if end_node is None:
+        if end_node == -1:
             raise Exception("Grid had no end node")
 
-        return Puzzle(start_node, end_node, cheat_length)
+        return Puzzle(grid, start_node, end_node, cheat_length)
 
     # strictly we only need one of these but having both as explicit entry points is nice
-    def __init__(self, start_node, end_node, max_cheat_length):
+    def __init__(self, grid, start_node, end_node, max_cheat_length):
+        # nodes are flat indices into the grid
+        self.grid = grid
         self.start_node = start_node
         self.end_node = end_node
         self.max_cheat_length = max_cheat_length
     
+    # anywhere on the grid that isn't a wall (the border round the outside isn't on the grid)
+    def is_free(self, node):
+        tile = self.grid[node]
+        return tile != Tile.WALL and tile != self.grid.border
+    
+    def neighbours(self, node):
+        return [node + d for d in self.grid.directions if self.is_free(node + d)]
+    
     # compute every node's distance to the exit - this will help us when we consider cheats later
-    # since it's every node, just do some sort of search. I'll DFS it for ease of implementation
+    # since it's every node, just do a BFS out from the exit over the whole track
+    # distances live in a flat array alongside the grid, with INFINITY for anywhere the exit can't be reached from
     def compute_distances_to_end(self):
-        distances = {}
-        nodes = [(0, self.end_node)]
-
-        while len(nodes) > 0:
-            distance, this_node = nodes.pop()
-
-            # already considered a node, don't look again
-            if this_node in distances:
-                continue
-
-            distances[this_node] = distance
-
-            for neighbour in this_node.neighbours:
-                if neighbour not in distances:
-                    nodes.append((distance+1, neighbour))
-
-        return distances
+        return bfs(len(self.grid.cells), [self.end_node], self.neighbours).dist
     
     # find cheats from a node, given the distances to the end for each
     # returns a list of all the cheats possible, sorted by time saved
@@ -114,29 +69,27 @@ class Puzzle:
         # figure out every node we could reach in that many steps
         # "Because this cheat has the same start and end positions as the one above, it's the same cheat"
         # i.e. - there are multiple paths from a start node to a given target node (we could dawdle wandering through walls if we want), but we only count the shortest path to that node
-        # i.e. don't even accumulate those in our reachable set
-        already_reachable = set([from_node])
-        reachables = [already_reachable]
-        for _ in range(self.max_cheat_length):
-            new_reachable = set()
-            for node in reachables[-1]:
-                for neighbour in node.cheat_neighbours:
-                    if neighbour not in already_reachable:
-                        new_reachable.add(neighbour)
-
-            reachables.append(new_reachable)
-            already_reachable = already_reachable.union(new_reachable)
-
+        # since a cheat can go through anything, the shortest path to a target is just its manhattan distance, so rather than spreading out
+        # step by step we can walk the diamond of positions within max_cheat_length directly (skipping any that fall off the grid)
+        grid = self.grid
+        (x, y) = grid.coords(from_node)
         
         # now figure out the time-save
         cheats = []
-        for (cheat_length, reachable_set) in enumerate(reachables):
-            for target_node in reachable_set:
-                # clipping into a wall is never a time-save
-                if target_node.tile_type == Tile.WALL:
+        for dy in range(-self.max_cheat_length, self.max_cheat_length + 1):
+            if not 0 <= y + dy < grid.height:
+                continue
+
+            reach = self.max_cheat_length - abs(dy)
+            for dx in range(max(-reach, -x), min(reach, grid.width - 1 - x) + 1):
+                target_node = from_node + dy * grid.stride + dx
+
+                # clipping into a wall is never a time-save (and neither is ending up somewhere we can't finish from)
+                if distances[target_node] == INFINITY:
                     continue
 
-                # otherwise, the time saved is the difference in distances minus the length of the cheat, and track which node it's to (nb. set means we're not going to end up with duplicates)
+                # otherwise, the time saved is the difference in distances minus the length of the cheat, and track which node it's to (nb. each target only appears once)
+                cheat_length = abs(dx) + abs(dy)
                 time_save = distances[from_node] - distances[target_node] - cheat_length
 
                 if time_save >= 0:
@@ -146,44 +99,25 @@ class Puzzle:
 
         
     # every possible cheat is just skipping two tiles, and we can easily compute the time saved as the value on this node versus the distance so far
-    # and by DFSing out from the start node we can do that for every single node
+    # and by searching out from the start node we can do that for every single node
     def get_num_cheats(self, debug=False):
         distances = self.compute_distances_to_end()
 
-        # now, for every node...
-        considered = set()
-        nodes = [self.start_node]
-
+        # now, for every node we can get to from the start...
         cheats = defaultdict(int)
-        while len(nodes) > 0:
-            this_node = nodes.pop()
-
-            if this_node in considered:
-                continue
-
+        for this_node in bfs(len(self.grid.cells), [self.start_node], self.neighbours).order:
             these_cheats = self.find_cheats(this_node, distances)
             for (time_save, target) in these_cheats:
                 if debug:
-                    print(f"Cheat found: {this_node} to {target} (saved {time_save} picoseconds)")
+                    print(f"Cheat found: {self.grid.coords(this_node)} to {self.grid.coords(target)} (saved {time_save} picoseconds)")
 
                 cheats[time_save] += 1
-
-            for neighbour in this_node.neighbours:
-                if neighbour not in considered:
-                    nodes.append(neighbour)
-
-            considered.add(this_node)
         
         return cheats
 
 
-def accept_input():
-    lines = []
-    try:
-        while True:
-            lines.append(input())
-    except EOFError:
-        return Puzzle.from_lines(lines, 2)
+def accept_input(source=None):
+    return Puzzle.from_grid(Grid.read(source), 2)
 
 def part1(puzzle, debug=False):
     cheats = puzzle.get_num_cheats(debug=debug)
@@ -214,4 +148,5 @@ def main():
     print(f"Part 1: {part1(puzzle, debug=True)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
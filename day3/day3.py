@@ -1,22 +1,27 @@
 # this should be my final day doing it in Python given I have a free evening tonight
 
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
 import re
 
+from aoc.inputs import iter_chunks, read_bytes
+from aoc.trace import channel
+
+part2_trace = channel('day3.part2')
+
 # these regexes mean that both parts can be solved with just plain old findall
 # the basic mul regex just grabs instances of the mul instruction (part1)
 # the do/don't regex just grabs the do/don't as a capture group, which we can use to iterate through
 # then we compose both of those together as a non-capturing alternation
-mul_re_str = r'mul\((\d{1,3}),(\d{1,3})\)'
+# these are bytes patterns so they can run straight over the (memory-mapped) input without decoding it
+mul_re_str = rb'mul\((\d{1,3}),(\d{1,3})\)'
 mul_re = re.compile(mul_re_str)
-mul_do_dont_re = re.compile(r"(?:(do(?:n\'t)?\(\))|" + mul_re_str + ')')
+mul_do_dont_re = re.compile(rb"(?:(do(?:n\'t)?\(\))|" + mul_re_str + b')')
 
-def accept_input():
-    blob = ""
-    while True:
-        try:
-            blob += input()
-        except EOFError:
-            return blob
+# no need to join lines together any more - none of the instructions can span a newline anyway
+def accept_input(source=None):
+    return read_bytes(source)
 
 def part1(memory):
     matches = mul_re.findall(memory)
@@ -30,15 +35,150 @@ def part2(memory):
     total = 0
     enabled = True
     for match in matches:
-        print(match)
-        if match[0] == "don't()":
+        if part2_trace.enabled:
+            part2_trace(match)
+            part2_trace.count(match[0] or "mul")
+        if match[0] == b"don't()":
             enabled = False
-        elif match[0] == "do()":
+        elif match[0] == b"do()":
             enabled = True
         elif enabled:
             total += int(match[1]) * int(match[2])
     return total
-        
+
+# a streaming version (python -m aoc run 3 --mode stream) for memory dumps too big to hold, read a chunk at a time
+# both parts come out of the same pass, so the scan happens as the input is read, and the parts just hand back its sums
+#
+# an instruction can be cut in half where one chunk ends, so anything starting in a chunk's last MAX_TOKEN - 1 bytes is
+# left for the next chunk to pick up, along with whether the last do/don't turned the muls off
+MAX_TOKEN = len(b"mul(999,999)")
+
+# scans buffer for instructions starting before limit, returning the sum of all the muls and of just the enabled ones,
+# whether muls are enabled afterwards, and where the last instruction it took ended
+def scan_buffer(buffer, enabled, limit):
+    total = enabled_total = 0
+    resume = 0
+    for match in mul_do_dont_re.finditer(buffer):
+        if match.start() >= limit:
+            break
+        resume = match.end()
+        instruction = match[1]
+        if instruction == b"don't()":
+            enabled = False
+        elif instruction == b"do()":
+            enabled = True
+        else:
+            product = int(match[2]) * int(match[3])
+            total += product
+            if enabled:
+                enabled_total += product
+    return total, enabled_total, enabled, resume
+
+def scan_stream(source=None):
+    total = enabled_total = 0
+    enabled = True
+    tail = b''
+    for chunk in iter_chunks(source):
+        buffer = tail + chunk
+        limit = len(buffer) - (MAX_TOKEN - 1)
+        (chunk_total, chunk_enabled_total, enabled, resume) = scan_buffer(buffer, enabled, limit)
+        total += chunk_total
+        enabled_total += chunk_enabled_total
+        tail = buffer[max(resume, limit, 0):]
+
+    # nothing can carry on past the end of the input, so whatever's left is taken as it is
+    (chunk_total, chunk_enabled_total, enabled, resume) = scan_buffer(tail, enabled, len(tail))
+    return total + chunk_total, enabled_total + chunk_enabled_total
+
+def accept_input_stream(source=None):
+    return scan_stream(source)
+
+def part1_stream(total, enabled_total):
+    return total
+
+def part2_stream(total, enabled_total):
+    return enabled_total
+
+# a parallel version (python -m aoc run 3 --mode parallel) that splits the dump into one chunk per CPU and scans them in
+# worker processes. each chunk owns the instructions that start inside it, and reads up to MAX_TOKEN - 1 bytes into the
+# next one to finish off any it starts. no chunk knows whether the muls are enabled when it starts, so each one reports:
+#     - the sum of every mul (part 1)
+#     - the enabled sum before its first do/don't, which only counts if the muls were enabled coming into the chunk
+#     - the enabled sum after that, which doesn't depend on what came before
+#     - whether its last do/don't leaves the muls enabled (or None, if it has none and so passes on what it was given)
+# and then those get combined in order, each chunk starting with whatever the chunks before it left things as
+# chunks smaller than MIN_CHUNK aren't worth starting a process for
+MIN_CHUNK = 1 << 20
+
+def scan_chunk(memory, start, end):
+    total = before = after = 0
+    enabled = None
+    for match in mul_do_dont_re.finditer(memory, start, min(len(memory), end + MAX_TOKEN - 1)):
+        if match.start() >= end:
+            break
+        instruction = match[1]
+        if instruction == b"don't()":
+            enabled = False
+        elif instruction == b"do()":
+            enabled = True
+        else:
+            product = int(match[2]) * int(match[3])
+            total += product
+            if enabled is None:
+                before += product
+            elif enabled:
+                after += product
+    return total, before, after, enabled
+
+# run in the workers, which map the file for themselves rather than having their chunk sent over
+def scan_file_chunk(path, start, end):
+    with open(path, 'rb') as f:
+        memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return scan_chunk(memory, start, end)
+    finally:
+        memory.close()
+
+def scan_parallel(source=None, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if isinstance(source, (str, os.PathLike)):
+        size = os.path.getsize(source)
+        memory = None
+    else:
+        # stdin or an open file have to be read in full first, and then each worker gets its chunk (and overlap) sent over
+        memory = read_bytes(source)
+        size = len(memory)
+
+    count = max(1, min(workers, size // MIN_CHUNK))
+    bounds = [size * i // count for i in range(count + 1)]
+    if count == 1:
+        chunks = [scan_chunk(memory if memory is not None else read_bytes(source), 0, size)]
+    else:
+        with ProcessPoolExecutor(max_workers=count) as pool:
+            if memory is None:
+                futures = [pool.submit(scan_file_chunk, source, start, end) for (start, end) in zip(bounds, bounds[1:])]
+            else:
+                futures = [pool.submit(scan_chunk, memory[start:end + MAX_TOKEN - 1], 0, end - start) for (start, end) in zip(bounds, bounds[1:])]
+            chunks = [future.result() for future in futures]
+
+    total = enabled_total = 0
+    enabled = True
+    for (chunk_total, before, after, chunk_enabled) in chunks:
+        total += chunk_total
+        enabled_total += (before if enabled else 0) + after
+        if chunk_enabled is not None:
+            enabled = chunk_enabled
+    return total, enabled_total
+
+def accept_input_parallel(source=None):
+    return scan_parallel(source)
+
+def part1_parallel(total, enabled_total):
+    return total
+
+def part2_parallel(total, enabled_total):
+    return enabled_total
+
     
 def main():
     memory = accept_input()
@@ -48,4 +188,6 @@ def main():
     part2_result = part2(memory)
     print(f"Part 2: {part2_result}")
     
-main()
\ No newline at end of file
+
+if __name__ == '__main__':
+    main()
@@ -1,70 +1,92 @@
 # okay, didn't have time for that harness I was hoping for last night. so we're Pythoning again
 
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import itertools
+import os
 
-def accept_input():
-    out = []
-    while True:
-        try:
-            line = input()
-            out.append(line)
-        except EOFError:
-            return out
-
-def is_xmas(wordsearch, offsets, i, j):
-    for o in offsets:
-        new_i, new_j = i+o[0], j+o[1]
-        
-        # don't go out of bounds (Python will automatically wrap the string for us if we go negative which we don't want)
-        if new_i < 0 or new_j < 0 or new_i >= len(wordsearch) or new_j >= len(wordsearch[0]):
-            return False
-        
-        if wordsearch[new_i][new_j] != o[2]:
+from aoc.grid import Grid
+from aoc.inputs import read_grid
+from aoc.trace import channel
+from aoc.wordsearch import Automaton
+
+count_xmases_trace = channel('day4.count_xmases')
+
+X, M, A, S = b"XMAS"
+
+# padding the grid by 3 means stepping up to 3 letters away in any direction never leaves it, so no bounds checks needed
+# (which also means we can't accidentally wrap round to the other end of a row like negative string indices would)
+def accept_input(source=None):
+    return Grid.read(source, pad=3)
+
+# turns (delta_i, delta_j, letter) offsets into (flat index offset, letter)
+def flatten_offsets(stride, offsets):
+    return [(o[0] * stride + o[1], o[2]) for o in offsets]
+
+# the offsets only depend on the row stride, so work them out once per grid rather than once per letter
+@functools.cache
+def xmas_offsets(stride):
+    all_offsets = []
+    for d in itertools.product((-1,0,1),(-1,0,1)):
+        # stepping once in the direction is M, then A, then S
+        offsets = [(0,0,X),(d[0], d[1], M), (2*d[0], 2*d[1], A), (3*d[0], 3*d[1], S)]
+        all_offsets.append((d, flatten_offsets(stride, offsets)))
+    return all_offsets
+
+@functools.cache
+def crossmas_offsets(stride):
+    all_offsets = []
+    # the three components are (delta_i, delta_j, direction of other MAS)
+    for d in itertools.product((-1, 1), (-1, 1), (-1, 1)):
+        # we want the current character to be an A...
+        offsets = ((0,0,A),
+            # stepping in one direction to be M in front and S behind....
+            (d[0],d[1],M),(-d[0],-d[1],S),
+            # and stepping in the adjacent direction to be either an M in front and an S behind or vice-versa
+            (d[2] * d[0], d[2] * -d[1],M),(d[2] * -d[0], d[2] * d[1],S))
+        all_offsets.append(flatten_offsets(stride, offsets))
+    return all_offsets
+
+def is_xmas(wordsearch, offsets, index):
+    cells = wordsearch.cells
+    for (o, letter) in offsets:
+        if cells[index + o] != letter:
             return False
     
     return True
 
 
 # solve this by iterating over the wordsearch looking for XMAS in any direction starting from the letter X
-def count_xmases(wordsearch, i, j):
+def count_xmases(wordsearch, index):
     # only count starting from an instance of the letter X
-    if wordsearch[i][j] != "X":
+    if wordsearch[index] != X:
         return 0
     
     count = 0
     # consider each possible direction that an XMAS might appear in...
-    for d in itertools.product((-1,0,1),(-1,0,1)):
-        # stepping once in the direction is M, then A, then S
-        offsets = [(0,0,'X'),(d[0], d[1], 'M'), (2*d[0], 2*d[1], 'A'), (3*d[0], 3*d[1], 'S')]
-        if is_xmas(wordsearch, offsets, i, j):
+    for (d, offsets) in xmas_offsets(wordsearch.stride):
+        if is_xmas(wordsearch, offsets, index):
             count += 1
-            print(f"XMAS at ({j},{i}) in direction {d[1],d[0]}")
+            if count_xmases_trace.enabled:
+                count_xmases_trace(f"XMAS at {wordsearch.coords(index)} in direction {d[1],d[0]}")
     
     return count
 
-def count_crossmasses(wordsearch, i, j):
+def count_crossmasses(wordsearch, index):
     # only count starting from an A (as each crossmas has only one A)
-    if wordsearch[i][j] != "A":
+    if wordsearch[index] != A:
         return 0
     
-    # the three components are (delta_i, delta_j, direction of other MAS)
-    for d in itertools.product((-1, 1), (-1, 1), (-1, 1)):
-        # we want the current character to be an A...
-        offsets = ((0,0,'A'),
-            # stepping in one direction to be M in front and S behind....
-            (d[0],d[1],'M'),(-d[0],-d[1],'S'),
-            # and stepping in the adjacent direction to be either an M in front and an S behind or vice-versa
-            (d[2] * d[0], d[2] * -d[1],'M'),(d[2] * -d[0], d[2] * d[1],'S'))
-        if is_xmas(wordsearch, offsets, i, j):
+    for offsets in crossmas_offsets(wordsearch.stride):
+        if is_xmas(wordsearch, offsets, index):
             return 1
             
     return 0
 
 def find_all_xmases(wordsearch, score_function):
     xmases = 0
-    for i in range(len(wordsearch)):
-        for j in range(len(wordsearch[0])):
-            xmases += score_function(wordsearch, i, j)
+    for index in wordsearch.indices():
+        xmases += score_function(wordsearch, index)
     return xmases
     
 def part1(wordsearch):
@@ -73,6 +95,132 @@ def part1(wordsearch):
 def part2(wordsearch):
     return find_all_xmases(wordsearch, count_crossmasses)
 
+# searching for lots of words at once: every line through the grid (rows, columns, and both families of diagonals) in
+# both directions, run through one automaton (see aoc.wordsearch), so each cell is looked at 8 times however many words
+# there are. counts are per direction, like part 1, so a palindrome gets found once each way
+def grid_lines(wordsearch):
+    (w, h, stride, cells) = (wordsearch.width, wordsearch.height, wordsearch.stride, wordsearch.cells)
+    starts = []
+    for y in range(h):
+        starts.append((wordsearch.index(0, y), 1, w))
+    for x in range(w):
+        starts.append((wordsearch.index(x, 0), stride, h))
+    # diagonals going down and right start along the top or down the left side...
+    for x in range(w):
+        starts.append((wordsearch.index(x, 0), stride + 1, min(w - x, h)))
+    for y in range(1, h):
+        starts.append((wordsearch.index(0, y), stride + 1, min(w, h - y)))
+    # ...and going down and left, along the top or down the right side
+    for x in range(w):
+        starts.append((wordsearch.index(x, 0), stride - 1, min(x + 1, h)))
+    for y in range(1, h):
+        starts.append((wordsearch.index(w - 1, y), stride - 1, min(w, h - y)))
+
+    for (start, step, length) in starts:
+        line = cells[start:start + (length - 1) * step + 1:step]
+        yield line
+        yield line[::-1]
+
+def count_words(wordsearch, words):
+    return Automaton(words).count(grid_lines(wordsearch))
+
+# python -m aoc run 4 --mode automaton solves part 1 that way
+def part1_automaton(wordsearch):
+    return count_words(wordsearch, ["XMAS"])["XMAS"]
+
+# vectorised versions (python -m aoc run 4 --mode numpy) for big grids
+# rather than visiting each cell, compare the whole grid against each letter once, and then a word in some direction is
+# those masks stepped along by 0, 1, 2 and 3 cells in that direction and ANDed together. the border means every step
+# stays inside the padded array, so stepping is just slicing it
+def shifted(mask, wordsearch, steps, d):
+    (h, w, pad) = (wordsearch.height, wordsearch.width, wordsearch.pad)
+    (y, x) = (pad + steps * d[0], pad + steps * d[1])
+    return mask[y:y + h, x:x + w]
+
+def letter_masks(wordsearch, letters):
+    cells = wordsearch.array(padded=True)
+    return [cells == letter for letter in letters]
+
+# rows picks which rows' matches to count (by the row the X or the A is on), for counting one band of a bigger grid
+def part1_numpy(wordsearch, rows=slice(None)):
+    import numpy as np
+
+    masks = letter_masks(wordsearch, (X, M, A, S))
+    count = 0
+    for d in itertools.product((-1, 0, 1), (-1, 0, 1)):
+        if d == (0, 0):
+            continue
+        found = shifted(masks[0], wordsearch, 0, d).copy()
+        for (steps, mask) in enumerate(masks[1:], 1):
+            found &= shifted(mask, wordsearch, steps, d)
+        count += int(np.count_nonzero(found[rows]))
+    return count
+
+def part2_numpy(wordsearch, rows=slice(None)):
+    import numpy as np
+
+    (is_m, is_a, is_s) = letter_masks(wordsearch, (M, A, S))
+    found = shifted(is_a, wordsearch, 0, (0, 0)).copy()
+    # each diagonal through the A has to have an M at one end and an S at the other
+    for d in ((1, 1), (1, -1)):
+        forwards = shifted(is_m, wordsearch, -1, d) & shifted(is_s, wordsearch, 1, d)
+        backwards = shifted(is_s, wordsearch, -1, d) & shifted(is_m, wordsearch, 1, d)
+        found &= forwards | backwards
+    return int(np.count_nonzero(found[rows]))
+
+# a tiled version (python -m aoc run 4 --mode tiled) for grids too big to hold (or to search on one core)
+# the grid is cut into bands of rows, and each band is searched in a worker process with the vectorised search above,
+# along with HALO rows either side of it so words running off the top or bottom of the band can still be seen
+# a match is only counted by the band its first letter (or for part 2, its A) is in, so matches crossing from one band
+# into the next get counted exactly once
+#
+# workers map the file for themselves and only ever build a grid for their own band (and halo), so no process needs more
+# than about BAND_CELLS cells in memory at once
+HALO = len(b"XMAS") - 1
+BAND_CELLS = 1 << 24
+
+def count_band(data, width, height, start, end):
+    first = max(0, start - HALO)
+    last = min(height, end + HALO)
+    stride = width + 1
+    band = Grid.from_buffer(memoryview(data)[first * stride:last * stride], width, last - first, pad=3)
+    rows = slice(start - first, end - first)
+    return part1_numpy(band, rows), part2_numpy(band, rows)
+
+def count_file_band(path, start, end):
+    (data, width, height) = read_grid(path)
+    return count_band(data, width, height, start, end)
+
+def search_tiled(source=None, workers=None):
+    (data, width, height) = read_grid(source)
+    band_height = max(1, BAND_CELLS // max(1, width))
+    bands = [(start, min(height, start + band_height)) for start in range(0, height, band_height)]
+    if len(bands) <= 1:
+        return count_band(data, width, height, 0, height)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if isinstance(source, (str, os.PathLike)):
+            futures = [pool.submit(count_file_band, source, start, end) for (start, end) in bands]
+        else:
+            # stdin or an open file is already in memory, so each worker gets sent its band (and halo) instead
+            futures = []
+            for (start, end) in bands:
+                first = max(0, start - HALO)
+                last = min(height, end + HALO)
+                band = bytes(data[first * (width + 1):last * (width + 1)])
+                futures.append(pool.submit(count_band, band, width, last - first, start - first, end - first))
+        counts = [future.result() for future in futures]
+    return sum(count[0] for count in counts), sum(count[1] for count in counts)
+
+def accept_input_tiled(source=None):
+    return search_tiled(source)
+
+def part1_tiled(xmases, crossmases):
+    return xmases
+
+def part2_tiled(xmases, crossmases):
+    return crossmases
+
 def main():
     wordsearch = accept_input()
     part1_score = part1(wordsearch)
@@ -80,4 +228,5 @@ def main():
     part2_score = part2(wordsearch)
     print(f"Part 2 (X-MASes): {part2_score}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -2,23 +2,25 @@
 
 from collections import defaultdict
 
-def accept_input():
+from aoc.inputs import iter_lines, read_sections
+from aoc.memo import MISSING, bounded_memo
+from aoc.trace import channel
+
+valid_update_trace = channel('day5.valid_update')
+part1_trace = channel('day5.part1')
+part2_trace = channel('day5.part2')
+stream_trace = channel('day5.stream')
+
+def accept_input(source=None):
+    rule_lines, update_lines = read_sections(source)[:2]
+
     rules = []
-    while True:
-        line = input()
-        if not line:
-            break
+    for line in rule_lines:
         x,y = line.split('|')
         rules.append((int(x),int(y)))
     
-    updates = []
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            return rules, updates
-        
-        updates.append([int(x) for x in line.split(',')])
+    updates = [list(map(int, line.split(','))) for line in update_lines if line]
+    return rules, updates
 
 
 # Part 1
@@ -39,14 +41,41 @@ def build_lookups(rules):
     
     return rule_lookup
 
-def valid_update(lookup, update):
-    previous_values = set()
+# the sets version builds a set of the pages so far and intersects it for every page, which adds up over millions of
+# updates. instead, compile the rules once: every page that appears in a rule gets a bit, and each page gets a mask of
+# the pages that have to come after it. then checking a page is one AND against a mask of the pages seen so far, and
+# adding it is one OR - with the hundred-odd pages of a real input each mask fits in a machine word
+class RuleIndex:
+    def __init__(self, rules):
+        self.bits = {}
+        self.after = {}
+        # and the other way round, the pages that have to come before each page (for sorting, in part 2)
+        self.before = {}
+        for (x, y) in rules:
+            for page in (x, y):
+                if page not in self.bits:
+                    self.bits[page] = 1 << len(self.bits)
+                    self.after[page] = 0
+                    self.before[page] = 0
+            self.after[x] |= self.bits[y]
+            self.before[y] |= self.bits[x]
+        # frozensets cache their hash, so this can key the memo of sorted updates for next to nothing
+        self.rules = frozenset(rules)
+
+def valid_update(index, update):
+    (bits, after) = (index.bits, index.after)
+    seen = 0
     for v in update:
-        prohibited_values = lookup[v]
-        print(f"{v} must appear before {prohibited_values}")
-        if len(previous_values.intersection(prohibited_values)) != 0:
+        # a page no rule mentions can't break any of them
+        bit = bits.get(v)
+        if bit is None:
+            continue
+        if valid_update_trace.enabled:
+            valid_update_trace(f"{v} must appear before {[page for page in bits if after[v] & bits[page]]}")
+            valid_update_trace.count("pages")
+        if seen & after[v]:
             return False
-        previous_values.add(v)
+        seen |= bit
     return True
 
 def get_middle_value(update):
@@ -55,46 +84,125 @@ def get_middle_value(update):
     return update[mid_index]
 
 def part1(rules, updates):
-    lookup = build_lookups(rules)
-    print(lookup)
+    index = RuleIndex(rules)
+    if part1_trace.enabled:
+        part1_trace(build_lookups(rules))
     
     count = 0
     for update in updates:
-        if valid_update(lookup, update):
+        if valid_update(index, update):
             middle_page_number = get_middle_value(update)
-            print(f"{update} is valid, adding middle_page_number {middle_page_number}")
+            if part1_trace.enabled:
+                part1_trace(f"{update} is valid, adding middle_page_number {middle_page_number}")
+                part1_trace.count("valid updates")
             count += middle_page_number
     return count
 
 # Part 2
-# we're building a sorting algorithm using these non-standard comparison rules!
-# my naive idea was very similar to an insertion sort (do the set membership tests again, if something is in the wrong place, pop it across)
-# however it's actually pretty easy to do a quicksort too - take the first one as a pivot, and being "in the set" puts it on the right partition (otherwise put it on the left)
-# we'll do this out-of-place by separating and combining lists simply because it's easier to write and reason about (I could do an in-place one if I wanted but not required for performance here)
-def quicksort(update, lookup):
-    if len(update) < 2:
-        return update
-    pivot = update[0]
-    after_pivot = lookup[pivot]
-    left, right = [], []
-    for v in update[1:]:
-        if v in after_pivot:
-            right.append(v)
+# my first go at this was a quicksort using the rules as the comparison, but that rebuilt lists at every level and
+# could go quadratic. really what we want is a topological sort of the rules between just the pages in the update
+#
+# the quick way in: a page's place in the sorted update is how many of the update's pages have to come before it, which
+# is one AND and a bit count per page. that's exact when the rules order every pair of pages in the update (which they do
+# in the real inputs), and otherwise it's checked, and if it's wrong we fall back to a proper topological sort
+#
+# the same set of pages always sorts the same way under the same rules, and updates repeat page sets a lot, so the
+# sorted orders are memoised by (rules, pages) - which, like day 19, lets the memo carry over between inputs
+sorted_updates = bounded_memo('day5.sort_update')
+
+def update_mask(index, update):
+    mask = 0
+    for v in update:
+        mask |= index.bits.get(v, 0)
+    return mask
+
+def topological_sort(index, update):
+    mask = update_mask(index, update)
+    ranked = sorted(update, key=lambda v: (index.before.get(v, 0) & mask).bit_count())
+    if valid_update(index, ranked):
+        return ranked
+
+    # Kahn's algorithm: keep taking the first page with nothing left that has to come before it
+    remaining = list(update)
+    ordered = []
+    while remaining:
+        for (i, v) in enumerate(remaining):
+            if index.before.get(v, 0) & mask == 0:
+                break
         else:
-            left.append(v)
-    return quicksort(left, lookup) + [pivot] + quicksort(right, lookup)
+            raise Exception(f"The rules for update {update} contain a cycle, so it can't be sorted")
+        ordered.append(remaining.pop(i))
+        mask &= ~index.bits.get(v, 0)
+    return ordered
+
+# returns whether the update was already in order, along with it sorted
+def sort_update(index, update):
+    if valid_update(index, update):
+        return True, update
+
+    pages = frozenset(update)
+    # a repeated page would be lost from the key, so don't memoise those
+    if len(pages) != len(update):
+        return False, topological_sort(index, update)
+
+    ordered = sorted_updates[(index.rules, pages)]
+    if ordered is MISSING:
+        # as a tuple, since it's shared with everything else that sorts these pages
+        ordered = tuple(topological_sort(index, update))
+        sorted_updates[(index.rules, pages)] = ordered
+    return False, ordered
 
 def part2(rules, updates):
-    lookup = build_lookups(rules)
+    index = RuleIndex(rules)
     
     count = 0
     for update in updates:
-        sorted_update = quicksort(update, lookup)
-        print(f"update: {update}, sorted: {sorted_update}")
-        if update != sorted_update:
+        (already_sorted, sorted_update) = sort_update(index, update)
+        if part2_trace.enabled:
+            part2_trace(f"update: {update}, sorted: {sorted_update}")
+        if not already_sorted:
             count += get_middle_value(sorted_update)
     return count
-    
+
+# a streaming version (python -m aoc run 5 --mode stream) for an endless feed of updates, e.g. piped in from elsewhere
+# the rules get compiled once, and then each update is dealt with as its line arrives, only keeping the running totals
+# --trace day5.stream prints them after every update
+def stream_totals(source=None):
+    lines = iter_lines(source)
+    rules = []
+    for line in lines:
+        # the rules end at the first blank line
+        if not line:
+            break
+        x,y = line.split('|')
+        rules.append((int(x),int(y)))
+    index = RuleIndex(rules)
+
+    (part1_total, part2_total) = (0, 0)
+    for line in lines:
+        if not line:
+            continue
+        update = list(map(int, line.split(',')))
+        (already_sorted, sorted_update) = sort_update(index, update)
+        if already_sorted:
+            part1_total += get_middle_value(update)
+        else:
+            part2_total += get_middle_value(sorted_update)
+        yield part1_total, part2_total
+
+def accept_input_stream(source=None):
+    totals = (0, 0)
+    for totals in stream_totals(source):
+        if stream_trace.enabled:
+            stream_trace(f"part 1: {totals[0]}, part 2: {totals[1]}")
+    return totals
+
+def part1_stream(part1_total, part2_total):
+    return part1_total
+
+def part2_stream(part1_total, part2_total):
+    return part2_total
+
 
 def main():
     rules, updates = accept_input()
@@ -104,4 +212,5 @@ def main():
     part2_score = part2(rules, updates)
     print(f"Part2: {part2_score}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
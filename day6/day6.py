@@ -1,117 +1,153 @@
-def accept_input():
-    # for ease of iteration this is a (y,x) coordinate
-    guard_position = None
-    occupancy = []
-    
-    # we're tracking the current line number so we know where the guard is
-    i = 0
-    while True:
-        try:
-            line = input()
-        except EOFError:
-            if guard_position is None:
-                raise Exception("Map did not set guard position")
-            return occupancy, guard_position
-        line_occupancy = []
-        for (j,c) in enumerate(line):
-            if c == '.':
-                line_occupancy.append(False)
-            elif c == '#':
-                line_occupancy.append(True)
-            elif c == '^':
-                guard_position = (i,j)
-                line_occupancy.append(False)
-        occupancy.append(line_occupancy)
-        i += 1
+from array import array
+
+from aoc.grid import Grid
+from aoc.trace import channel
+
+part2_trace = channel('day6.part2')
+
+OBSTACLE = ord('#')
+FREE = ord('.')
+
+def accept_input(source=None):
+    occupancy = Grid.read(source)
+    # the guard position is a flat index into the grid
+    guard_position = occupancy.find(ord('^'))
+    if guard_position == -1:
+        raise Exception("Map did not set guard position")
+    occupancy[guard_position] = FREE
+    return occupancy, guard_position
 
 def print_map(occupancy):
-    for line in occupancy:
-        print("".join(['#' if v else '.' for v in line]))
-def build_empty_map(occupancy):
-    # assume occupancy is a rectangular array (always true for our input, might not be true in general)
-    # i.e. no need to worry about it being ragged
-    return [[set() for _ in occupancy[0]] for _ in occupancy]
+    print(occupancy)
 
 def guard_on_map(occupancy, gp):
-    return gp[0] >= 0 and gp[0] < len(occupancy) and gp[1] >= 0 and gp[1] < len(occupancy[0])
+    return occupancy[gp] != occupancy.border
 
 class GuardLoop(Exception):
     pass
 
-def build_occupation_map(occupancy, guard_position):
+# stepping the guard one cell at a time is slow, and all that really matters is where they turn. so for every cell and
+# direction, work out where the guard would stop walking that way: the cell just before the next obstacle, or the border
+# cell just off the map if there isn't one. then a walk is one lookup per turn rather than one step per cell
+#
+# the stops are worked out a row or column at a time: every free cell between two obstacles stops at the same place,
+# so each run of them is filled in with one slice assignment
+class JumpTable:
+    def __init__(self, occupancy):
+        self.occupancy = occupancy
+        # one array per direction (in the same order as occupancy.directions), indexed by cell
+        self.stops = [array('q', [0]) * len(occupancy.cells) for _ in occupancy.directions]
+        for y in range(occupancy.height):
+            self.fill(occupancy.index(0, y), 1, occupancy.width, 3, 1)
+        for x in range(occupancy.width):
+            self.fill(occupancy.index(x, 0), occupancy.stride, occupancy.height, 0, 2)
+
+    # fills in the stops for one line of cells starting at first, one step apart, in the backward and forward directions
+    def fill(self, first, step, length, backward, forward):
+        line = self.occupancy.cells[first:first + length * step:step]
+        # each run of free cells goes from just after an obstacle (or the start) to just before the next (or the end)
+        start = 0
+        while start <= length:
+            end = line.find(OBSTACLE, start)
+            if end == -1:
+                end = length
+            if end > start:
+                (run_first, run_last) = (first + start * step, first + (end - 1) * step)
+                count = end - start
+                # walking backward stops on the run's first cell, or walks off the map if that's the start of the line
+                self.stops[backward][run_first:run_last + 1:step] = array('q', [run_first if start > 0 else run_first - step]) * count
+                self.stops[forward][run_first:run_last + 1:step] = array('q', [run_last if end < length else run_last + step]) * count
+            start = end + 1
+
+    # where the guard stops walking from position in direction d, if there's also an obstacle at extra (when that isn't None)
+    # the extra obstacle only matters if it's in line with position and no further away than the stop
+    def stop(self, position, d, extra=None):
+        stop = self.stops[d][position]
+        if extra is not None:
+            step = self.occupancy.directions[d]
+            if (position < extra <= stop if step > 0 else stop <= extra < position) and (extra - position) % step == 0:
+                return extra - step
+        return stop
+
+# the straight lines the guard walks before leaving the map, as (first cell, last cell, step, direction)
+def path_segments(occupancy, table, guard_position):
     # Assume that the guard is always facing up originally (this is true in both the example input and real input)
-    # this direction vector is also in (y,x) coordinates for ease of reasoning
-    guard_direction = (-1, 0)
-    ever_occupied = build_empty_map(occupancy)
-    
-    # reassign these to shorthands for ease of typing
-    gp = guard_position
-    gd = guard_direction
-    
-    
-    # while the guard is actually on the map, and not caught in a loop...
-    # (I didn't actually implement loop support until seeing part2 so I could've ended up looping forever before that)
-    while guard_on_map(occupancy, gp) and gd not in ever_occupied[gp[0]][gp[1]]:
-        ever_occupied[gp[0]][gp[1]].add(gd)
-        
-        next_step = (gp[0]+gd[0], gp[1]+gd[1])
-        # If there is something directly in front of you, turn right
-        if guard_on_map(occupancy, next_step) and occupancy[next_step[0]][next_step[1]]:
-            # up = (-1,0), right = (0,1), down = (1,0), left = (0,-1)
-            gd = (gd[1],-gd[0])
-        # otherwise take a step forward
+    # directions are indices into occupancy.directions, which go clockwise from up
+    turns = set()
+    (gp, gd) = (guard_position, 0)
+    while True:
+        stop = table.stop(gp, gd)
+        step = occupancy.directions[gd]
+        # stop short of the border cell if we're walking off the map
+        on_map = guard_on_map(occupancy, stop)
+        yield gp, stop if on_map else stop - step, step, gd
+        if not on_map:
+            return
+        # turning at the same place in the same direction as before means we'll go round the same way forever
+        if (stop, gd) in turns:
+            raise GuardLoop(f"Looped at {occupancy.coords(stop)}")
+        turns.add((stop, gd))
+        (gp, gd) = (stop, (gd + 1) % 4)
+
+# every cell the guard walks through before leaving the map, as a bytearray with 1 for each cell visited
+def walk_path(occupancy, table, guard_position):
+    visited = bytearray(len(occupancy.cells))
+    for (first, last, step, d) in path_segments(occupancy, table, guard_position):
+        if step > 0:
+            visited[first:last + 1:step] = b'\x01' * ((last - first) // step + 1)
         else:
-            gp = next_step
-    
-    # if the guard is still on the map as of the above, we ended up in the same direction at the same position as seen previously
-    if guard_on_map(occupancy, gp):
-        raise GuardLoop(f"Looped at {gp}")
-    
-    return ever_occupied
-        
+            visited[last:first + 1:-step] = b'\x01' * ((first - last) // -step + 1)
+    return visited
+
+# whether the guard walks in a loop from position facing d with an extra obstacle at extra, which is one lookup per turn
+def loops(occupancy, table, position, d, extra, seen, walk):
+    while True:
+        stop = table.stop(position, d, extra)
+        if not guard_on_map(occupancy, stop):
+            return False
+        state = stop * 4 + d
+        if seen[state] == walk:
+            return True
+        seen[state] = walk
+        (position, d) = (stop, (d + 1) % 4)
+
 def part1(occupancy, guard_position):
-    ever_occupied = build_occupation_map(occupancy, guard_position)
-    
-    # return the total number of positions which ever had a direction attached
-    return sum(sum((len(x) > 0) for x in row) for row in ever_occupied)    
+    visited = walk_path(occupancy, JumpTable(occupancy), guard_position)
+    return visited.count(1)
 
-# this works but is really quite slow - took a good few seconds on my machine
-# it would be easy to parallelise (different placements are independent) but doesn't really solve the underlying complexity problem
-# there are some other constant-factor improvements by using contiguous 2d arrays rather than ragged ones, and using a language other than Python with lower overheads
-# however this is more than fast enough to work in a reasonable amount of time
+# this used to copy the grid and re-walk it from the start a cell at a time for every placement, which took a good few seconds
+# but an obstacle only changes anything from the first time the guard would walk into it, and up to then the walk is
+# the same as without it. so walk the original path once, and at each cell it reaches for the first time, see whether
+# putting an obstacle there sends the guard into a loop from where they're standing just before it
+# (an obstacle on a cell the guard has already walked through would have changed their path before now)
+# that check is a walk over the jump table with the obstacle laid over it, so there's no copying the grid for each one
 def part2(occupancy, guard_position):
-    # a later optimisation - there's no point putting an obstacle somewhere the guard never walks
-    base_occupied = build_occupation_map(occupancy, guard_position)
+    table = JumpTable(occupancy)
+    visited = bytearray(len(occupancy.cells))
+    # the guard's standing on their starting cell, so that's never a candidate
+    visited[guard_position] = 1
 
-    # we can break this down back to the original position - just add a new obstacle in each valid position and then delegate back to part 1
+    # rather than allocating anything per walk, seen holds for each (cell, direction) the last walk that turned there
+    seen = array('q', [0]) * (len(occupancy.cells) * 4)
     valid_obstructions = 0
-    for (i,row) in enumerate(occupancy):
-        for (j,value) in enumerate(row):
-            # give up if this is an invalid obstruction placement
-            # i.e. there's already an obstruction here, or the guard is here
-            if value == True or ((i,j) == guard_position):
-                continue
-            
-            # later optimisation: don't consider positions the guard never goes to anyway
-            if len(base_occupied[i][j]) == 0:
+    walk = 0
+    for (first, last, step, d) in path_segments(occupancy, table, guard_position):
+        for index in range(first + step, last + step, step):
+            if visited[index]:
                 continue
-            
-            # add the obstruction
-            new_row = row[:j] + [True] + row[j+1:]
-            new_occupancy = occupancy[:i] + [new_row] + occupancy[i+1:]
-            
-            # run the simulation
-            try:
-                part1(new_occupancy, guard_position)
-            except GuardLoop:
-                print(f"Looped with obstacle at {(i,j)}")
+            visited[index] = 1
+
+            walk += 1
+            if loops(occupancy, table, index - step, d, index, seen, walk):
+                if part2_trace.enabled:
+                    part2_trace(f"Looped with obstacle at {occupancy.coords(index)}")
                 valid_obstructions += 1
     return valid_obstructions
         
 
 def main():
     occupancy, guard_position = accept_input()
-    print(f"Guard position {guard_position}, map:")
+    print(f"Guard position {occupancy.coords(guard_position)}, map:")
     print_map(occupancy)
     
     part1_score = part1(occupancy, guard_position)
@@ -120,4 +156,5 @@ def main():
     part2_score = part2(occupancy, guard_position)
     print(f"Part 2: {part2_score}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,14 @@
 
 from math import log10, floor
 
+from aoc.inputs import read_lines
+from aoc.trace import channel
+
+top_level_concats_trace = channel('day7.could_be_true_with_top_level_concats')
+bottom_level_concats_trace = channel('day7.could_be_true_with_bottom_level_concats')
+concats_trace = channel('day7.could_be_true_with_concats')
+could_be_true_trace = channel('day7.could_be_true')
+
 class Equation:
     def __init__(self, target, vals):
         self.target = target
@@ -24,13 +32,15 @@ class Equation:
         for i in range(1, len(target_st)):
             first_half = int(target_st[:i])
             second_half = int(target_st[i:])
-            print(f"decomposing {self.target} into {first_half} || {second_half}")
+            if top_level_concats_trace.enabled:
+                top_level_concats_trace(f"decomposing {self.target} into {first_half} || {second_half}")
             # now you need to iterate through the vals list to figure out the corresponding list
             for j in range(1,len(self.vals)):
                 first_half_vals = self.vals[:j]
                 second_half_vals = self.vals[j:]
 
-                print(f"trying to make ({first_half}, {second_half}) with ({first_half_vals}, {second_half_vals})")
+                if top_level_concats_trace.enabled:
+                    top_level_concats_trace(f"trying to make ({first_half}, {second_half}) with ({first_half_vals}, {second_half_vals})")
                 if Equation(first_half, first_half_vals).could_be_true_with_concats() and  Equation(second_half, second_half_vals).could_be_true_with_concats():
                     return True
         return False
@@ -41,14 +51,15 @@ class Equation:
             # base case, if the equation itself is true, then it's true with concats too
             if self.could_be_true():
                 return True
-            else:
-                print(f"Cannot make {self.target} with {self.vals}")
+            elif bottom_level_concats_trace.enabled:
+                bottom_level_concats_trace(f"Cannot make {self.target} with {self.vals}")
 
             # otherwise, the target is the same, but you can concatenate the values instead
             for i in range(1, len(self.vals)):
                 # try merging element i-1 with element i, and solving that equation
                 new_vals = self.vals[:(i-1)] + [int(str(self.vals[i-1]) + str(self.vals[i]))] + self.vals[(i+1):]
-                print(f"Trying to make {self.target} with {new_vals}")
+                if bottom_level_concats_trace.enabled:
+                    bottom_level_concats_trace(f"Trying to make {self.target} with {new_vals}")
                 if Equation(self.target, new_vals).could_be_true_with_concats():
                     return True
 
@@ -74,7 +85,9 @@ class Equation:
                 min_value += v
 
         if self.target < min_value:
-            print(f"Rejecting: minimum value for {self.vals} ({min_value}) less than {self.target}")
+            if concats_trace.enabled:
+                concats_trace(f"Rejecting: minimum value for {self.vals} ({min_value}) less than {self.target}")
+                concats_trace.count("rejected by minimum")
             return False
 
         # maximum value - now easier to calculate by just calculating all three and picking the biggest
@@ -83,7 +96,9 @@ class Equation:
             max_value = max(max_value + v, max_value * v, int(str(max_value) + str(v)))
 
         if self.target > max_value:
-            print(f"Rejecting: maximum possible value for {self.vals} ({max_value}) is less than {self.target}")
+            if concats_trace.enabled:
+                concats_trace(f"Rejecting: maximum possible value for {self.vals} ({max_value}) is less than {self.target}")
+                concats_trace.count("rejected by maximum")
             return False
 
         # the target is in the plausible range, so it makes sense to search for operators which might satisfy it
@@ -93,7 +108,9 @@ class Equation:
 
         concat_cand = self.target - last
         concat_mult = (10**floor(log10(last)+1))
-        print(f"{concat_cand}, {concat_mult}")
+        if concats_trace.enabled:
+            concats_trace(f"{concat_cand}, {concat_mult}")
+            concats_trace.count("candidates")
         return (concat_cand % concat_mult == 0 and Equation(concat_cand // concat_mult, tail).could_be_true_with_concats()) or (self.target % last == 0 and Equation(self.target / last, tail).could_be_true_with_concats()) or Equation(self.target - last, tail).could_be_true_with_concats()
 
     def could_be_true(self):
@@ -113,7 +130,9 @@ class Equation:
                 min_value += v
 
         if self.target < min_value:
-            print(f"Rejecting: minimum value for {self.vals} ({min_value}) less than {self.target}")
+            if could_be_true_trace.enabled:
+                could_be_true_trace(f"Rejecting: minimum value for {self.vals} ({min_value}) less than {self.target}")
+                could_be_true_trace.count("rejected by minimum")
             return False
 
         # maximum value - add ones and multiply by everything else
@@ -124,7 +143,9 @@ class Equation:
             else:
                 max_value *= v
         if self.target > max_value:
-            print(f"Rejecting: maximum possible value for {self.vals} ({max_value}) is less than {self.target}")
+            if could_be_true_trace.enabled:
+                could_be_true_trace(f"Rejecting: maximum possible value for {self.vals} ({max_value}) is less than {self.target}")
+                could_be_true_trace.count("rejected by maximum")
             return False
 
         # the target is in the plausible range, so it makes sense to search for operators which might satisfy it
@@ -133,17 +154,14 @@ class Equation:
         tail = self.vals[:-1]
         return (self.target % last == 0 and Equation(self.target / last, tail).could_be_true()) or Equation(self.target - last, tail).could_be_true()
 
-def accept_input():
+def accept_input(source=None):
     equations = []
-    while True:
-        try:
-            line = input()
-            line_parts = line.split(' ')
-            target = int(line_parts[0][:-1])
-            values = [int(v) for v in line_parts[1:]]
-            equations.append(Equation(target, values))
-        except EOFError:
-            return equations
+    for line in read_lines(source):
+        line_parts = line.split(' ')
+        target = int(line_parts[0][:-1])
+        values = [int(v) for v in line_parts[1:]]
+        equations.append(Equation(target, values))
+    return equations
 
 def part1(equations):
     return sum(e.target for e in equations if e.could_be_true())
@@ -157,4 +175,5 @@ def main():
     print(f"Part 1: {part1(equations)}")
     print(f"Part 2: {part2(equations)}")
 
-main()
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,11 @@ from collections import defaultdict
 from itertools import combinations
 import re
 
+from aoc.inputs import read_lines
+from aoc.trace import channel
+
+antinodes_part1_trace = channel('day8.get_antinodes_for_frequency_part1')
+get_antinodes_trace = channel('day8.get_antinodes')
 
 
 class Map:
@@ -17,7 +22,8 @@ class Map:
 
         antinodes = set()
         for (node1, node2) in combinations(antennae, 2):
-            print(f"node pair: {node1}, {node2}")
+            if antinodes_part1_trace.enabled:
+                antinodes_part1_trace(f"node pair: {node1}, {node2}")
             # the frequency generates two antinodes - consider the vector node1 -> node2, one antinode is node1 - (node1 -> node2), the other antinode is node2 + (node1 -> node2)
             # the vector (node1 -> node2) is node2 - node1, so substitute this in
             # i.e. the two antinode coordinates are
@@ -27,7 +33,8 @@ class Map:
             antinodes.add(antinode1)
             antinodes.add(antinode2)
 
-        print(f"antinodes for frequency {frequency}: {antinodes}")
+        if antinodes_part1_trace.enabled:
+            antinodes_part1_trace(f"antinodes for frequency {frequency}: {antinodes}")
         return antinodes
 
     def get_antinodes_for_frequency_part2(self, frequency):
@@ -74,7 +81,8 @@ class Map:
                 antinodes.add(antinode)
 
         # then return all the antinodes
-        print(f"Antinodes: {sorted(antinodes)}")
+        if get_antinodes_trace.enabled:
+            get_antinodes_trace(f"Antinodes: {sorted(antinodes)}")
         return antinodes
 
     def __init__(self, lines):
@@ -92,14 +100,8 @@ class Map:
 
                 self.frequency_lookup[v].append((x,y))
 
-def accept_input():
-    lines = []
-    while True:
-        try:
-            line = input()
-            lines.append(line)
-        except EOFError:
-            return Map(lines)
+def accept_input(source=None):
+    return Map(read_lines(source))
 
 def part1(puzzle):
     return len(puzzle.get_antinodes(puzzle.get_antinodes_for_frequency_part1))
@@ -113,4 +115,5 @@ def main():
     print(f"Part 1: {part1(puzzle)}")
     print(f"Part 2: {part2(puzzle)}")
 
-main()
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,5 @@
+from aoc.inputs import read_text
+
 class File:
     # represent free space as a "file" with None id
     def is_free(self):
@@ -39,9 +41,8 @@ def files_from_string(file_st):
     
     return files
 
-def accept_input():
-    line = input()
-    return files_from_string(line)
+def accept_input(source=None):
+    return files_from_string(read_text(source).strip())
 
 # you can do part1 without needing to ever expand the representation - have two pointers, one walking the list of files left to right and the other right to left
 # left to right one - add when you see actual files, and pull from the right hand side when you're on empty space
@@ -192,4 +193,5 @@ def main():
     print(f"Part 1: {part1(files)}")
     print(f"Part 2: {part2(files)}")
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import day1.day1 as day1
+
+# tiny blocks, so the lists split, empty out and get re-cut many times over even in a short run
+@pytest.mark.parametrize('seed', range(40))
+def test_location_lists_match_part1_and_part2(seed, monkeypatch):
+    monkeypatch.setattr(day1, 'BLOCK_SIZE', 2)
+    rng = random.Random(seed)
+    high = rng.choice([5, 30, 1000])
+    left = [rng.randint(0, high) for _ in range(rng.randint(0, 20))]
+    right = [rng.randint(0, high) for _ in range(len(left))]
+    lists = day1.LocationLists(left, right)
+
+    for _ in range(300):
+        choice = rng.random()
+        if choice < 0.3:
+            value = rng.randint(0, high)
+            left.append(value)
+            lists.add_left(value)
+        elif choice < 0.6:
+            value = rng.randint(0, high)
+            right.append(value)
+            lists.add_right(value)
+        elif choice < 0.8 and left:
+            value = rng.choice(left)
+            left.remove(value)
+            lists.remove_left(value)
+        elif right:
+            value = rng.choice(right)
+            right.remove(value)
+            lists.remove_right(value)
+
+        assert lists.similarity == day1.part2(left, right)
+        if len(left) == len(right):
+            assert lists.distance == day1.part1(left, right)
+        else:
+            with pytest.raises(Exception):
+                lists.distance
+
+def test_location_lists_recut_as_they_grow_and_shrink(monkeypatch):
+    monkeypatch.setattr(day1, 'BLOCK_SIZE', 2)
+    rng = random.Random(0)
+    (left, right) = ([], [])
+    lists = day1.LocationLists()
+    for value in rng.sample(range(10000), 2000):
+        left.append(value)
+        right.append(value + 1)
+        lists.add_left(value)
+        lists.add_right(value + 1)
+    # blocks grow with sqrt of the distinct values, rather than staying at the minimum
+    assert lists.block_size >= 40
+    assert lists.distance == day1.part1(left, right)
+
+    for value in list(left[:1900]):
+        left.remove(value)
+        right.remove(value + 1)
+        lists.remove_left(value)
+        lists.remove_right(value + 1)
+    assert lists.block_size < 40
+    assert (lists.distance, lists.similarity) == (day1.part1(left, right), day1.part2(left, right))
+
+def test_location_lists_refuse_to_remove_what_isnt_there():
+    lists = day1.LocationLists([1, 2], [2, 3])
+    with pytest.raises(Exception):
+        lists.remove_left(3)
+    with pytest.raises(Exception):
+        lists.remove_right(1)
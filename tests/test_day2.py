@@ -0,0 +1,40 @@
+from itertools import combinations
+import random
+
+import pytest
+
+import day2.day2 as day2
+
+def safe(report):
+    changes = [b - a for (a, b) in zip(report, report[1:])]
+    return all(1 <= change <= 3 for change in changes) or all(-3 <= change <= -1 for change in changes)
+
+# the obviously-correct version: try removing every set of up to k levels
+def brute_force(report, k):
+    for removed in range(k + 1):
+        for dropped in combinations(range(len(report)), removed):
+            if safe([v for (i, v) in enumerate(report) if i not in dropped]):
+                return 1
+    return 0
+
+@pytest.mark.parametrize('k', range(4))
+def test_is_report_safe_matches_brute_force(k):
+    rng = random.Random(k)
+    for _ in range(3000):
+        length = rng.randint(0, 10)
+        # mostly small steps, so plenty of reports are safe or nearly so, with the odd jump or repeat
+        start = rng.randint(1, 20)
+        direction = rng.choice([1, -1])
+        report = [start]
+        for _ in range(length - 1):
+            step = direction * rng.choice([1, 2, 3]) if rng.random() < 0.75 else rng.randint(-5, 5)
+            report.append(report[-1] + step)
+        report = report[:length]
+        assert day2.is_report_safe(report, k) == brute_force(report, k), (report, k)
+
+def test_is_report_safe_matches_the_original_part2():
+    rng = random.Random(0)
+    for _ in range(2000):
+        # (the original indexes report[1] after removing a level, so it needs at least three)
+        report = [rng.randint(1, 12) for _ in range(rng.randint(3, 8))]
+        assert day2.is_report_safe(report, 1) == day2.is_report_safe_p2(report), report
@@ -0,0 +1,35 @@
+from concurrent.futures import Future
+
+import day4.day4 as day4
+
+# runs everything in-process, remembering what each band was handed to
+class RecordingPool:
+    def __init__(self, max_workers=None):
+        self.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        self.submitted.append(fn)
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+def test_tiled_memory_maps_paths_of_any_kind(tmp_path, monkeypatch):
+    grid = "MMMSXXMASM\nMSAMXMSMSA\nAMXSXMAAMM\nMSAMASMSMX\nXMASAMXAMM\nXXAMMXXAMA\nSMSMSASXSS\nSAXAMASAAA\nMAMMMXMMMM\nMXMXAXMASX\n"
+    path = tmp_path / 'input.txt'
+    path.write_text(grid)
+    pools = []
+    monkeypatch.setattr(day4, 'ProcessPoolExecutor', lambda max_workers=None: pools.append(RecordingPool()) or pools[-1])
+    # a couple of rows per band, so there's more than one
+    monkeypatch.setattr(day4, 'BAND_CELLS', 20)
+
+    expected = day4.search_tiled(str(path))
+    assert day4.search_tiled(path) == expected == (18, 9)
+    # both the str and the Path were opened by the workers rather than sent over as bands
+    assert all(fn is day4.count_file_band for pool in pools for fn in pool.submitted)
+    assert len(pools) == 2 and len(pools[1].submitted) > 1
@@ -0,0 +1,39 @@
+import random
+
+from aoc.memo import MISSING, BoundedMemo, CountingMemo
+
+def test_bounded_memo_stays_under_its_cap():
+    for cls in (BoundedMemo, CountingMemo):
+        for cap in (2, 3, 10, 100):
+            memo = cls('test', cap)
+            rng = random.Random(cap)
+            for step in range(5000):
+                key = rng.randint(0, 3 * cap)
+                value = memo[key]
+                if value is MISSING:
+                    memo[key] = key * 7
+                else:
+                    assert value == key * 7
+                assert len(memo) <= cap
+                if step % 997 == 0:
+                    cap = rng.randint(2, 2 * cap)
+                    memo.resize(cap)
+                    assert len(memo) <= cap
+
+def test_bounded_memo_keeps_what_is_still_used():
+    memo = CountingMemo('test', 10)
+    memo['hot'] = 1
+    for key in range(1000):
+        assert memo[key] is MISSING
+        memo[key] = key
+        assert memo['hot'] == 1
+    assert (memo.hits, memo.misses) == (1000, 1000)
+
+def test_day11_only_looks_up_what_it_memoises():
+    import day11.day11 as day11
+
+    day11.memo.clear()
+    day11.memo.misses = 0
+    assert day11.part1([125, 17]) == 55312
+    # every miss should have been filled in - a lookup that isn't wastes room in the memo and drags the hit rate down
+    assert day11.memo.misses == len(day11.memo)
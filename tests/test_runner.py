@@ -0,0 +1,46 @@
+from aoc.cache import ResultCache
+from aoc.runner import solve_day
+
+def test_cache_keeps_modes_apart(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text("3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n")
+    cache = ResultCache(str(tmp_path / 'results.sqlite3'))
+
+    plain = solve_day(1, str(path), cache=cache)
+    assert plain['cached'] == []
+    assert solve_day(1, str(path), cache=cache)['cached'] == ['part1', 'part2']
+
+    # a different mode mustn't be handed the plain version's answers
+    external = solve_day(1, str(path), cache=cache, mode='external')
+    assert external['cached'] == []
+    assert (external['part1'], external['part2']) == (plain['part1'], plain['part2']) == (11, 31)
+    assert solve_day(1, str(path), cache=cache, mode='external')['cached'] == ['part1', 'part2']
+    cache.close()
+
+def test_cache_hands_paths_on(tmp_path, monkeypatch):
+    import day4.day4
+
+    path = tmp_path / 'input.txt'
+    path.write_text("XMAS\nSAMX\nMMMM\nXMAS\n")
+    cache = ResultCache(str(tmp_path / 'results.sqlite3'))
+
+    # the tiled mode only memory-maps the input in its workers if it's given the path, not the bytes
+    sources = []
+    search_tiled = day4.day4.search_tiled
+    monkeypatch.setattr(day4.day4, 'accept_input_tiled', lambda source=None: sources.append(source) or search_tiled(source))
+    tiled = solve_day(4, str(path), cache=cache, mode='tiled')
+    assert sources == [str(path)]
+    assert tiled['cached'] == []
+    cache.close()
+
+def test_cache_hashes_paths_and_streams_alike(tmp_path):
+    import io
+
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b"3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n")
+    cache = ResultCache(str(tmp_path / 'results.sqlite3'))
+
+    assert solve_day(1, path, cache=cache)['cached'] == []
+    # the same input through stdin (or any open file) is the same entry
+    assert solve_day(1, io.BytesIO(path.read_bytes()), cache=cache)['cached'] == ['part1', 'part2']
+    cache.close()
@@ -0,0 +1,36 @@
+import random
+
+from aoc.search import INFINITY, astar, bfs, dijkstra
+
+# a line of states, each stepping to the next at cost 1
+def line(state):
+    return [(state + 1, 1)] if state + 1 < 5 else []
+
+def test_bucket_dijkstra_sources_further_apart_than_max_cost():
+    result = dijkstra(5, {0: 0, 3: 5}, line, max_cost=1)
+    assert list(result.dist) == [0, 1, 2, 3, 4]
+
+    # a source that's the only way to reach something still gets settled, however far past the others it starts
+    result = dijkstra(6, {0: 0, 4: 100}, lambda s: [(s + 1, 1)] if s in (0, 1, 4) else [], max_cost=1)
+    assert list(result.dist) == [0, 1, 2, INFINITY, 100, 101]
+
+def test_bucket_dijkstra_matches_heap_with_spread_out_sources():
+    rng = random.Random(0)
+    for _ in range(200):
+        n = rng.randint(1, 30)
+        max_cost = rng.randint(1, 5)
+        edges = [[(rng.randrange(n), rng.randint(0, max_cost)) for _ in range(rng.randint(0, 3))] for _ in range(n)]
+        sources = {rng.randrange(n): rng.randint(0, 50) for _ in range(rng.randint(1, 4))}
+        bucketed = dijkstra(n, sources, edges.__getitem__, max_cost=max_cost)
+        heaped = astar(n, sources, edges.__getitem__, None)
+        assert list(bucketed.dist) == list(heaped.dist)
+
+def test_bucket_dijkstra_limit():
+    result = dijkstra(5, {0: 0, 3: 5}, line, max_cost=1, limit=2)
+    assert list(result.dist[:3]) == [0, 1, 2]
+    assert result.order == [0, 1, 2]
+
+def test_bfs_order_and_path():
+    result = bfs(5, [0], lambda s: [s + 1] if s + 1 < 5 else [], goals=[3])
+    assert result.goal == 3
+    assert result.path(3) == [0, 1, 2, 3]